@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Header, Query
-from app.core.config import settings
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.core.security import require_admin
+from app.core.responses import ORJSONResponse
 from app.schemas.api_keys import (
     KeyGenerationRequest, 
     KeyGenerationResponse, 
@@ -9,43 +10,34 @@ from app.schemas.api_keys import (
 )
 from app.services.api_keys import (
     generate_api_key, 
-    generate_multiple_keys, 
-    get_key_info
+    generate_multiple_keys_with_info, 
+    get_key_info,
+    now_iso
 )
-from datetime import datetime
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.post("/generate", response_model=KeyGenerationResponse)
+@router.post("/generate", response_model=KeyGenerationResponse, dependencies=[Depends(require_admin)])
 async def generate_keys(
-    request: KeyGenerationRequest,
-    x_admin_key: str = Header(None)
+    request: KeyGenerationRequest
 ):
     """Generate API keys of the specified type.
     
     Requires admin authentication to generate keys.
     """
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
-    
     try:
         # Generate the requested keys
-        keys = generate_multiple_keys(request.key_type, request.count)
+        keys_and_info = generate_multiple_keys_with_info(request.key_type, request.count)
         
         # Create response with key information
-        generated_keys = []
-        for key in keys:
-            key_info = get_key_info(key)
-            generated_keys.append(GeneratedKey(
-                key=key,
-                type=key_info["type"],
-                generated_at=key_info["generated_at"],
-                info=key_info
-            ))
+        generated_keys = [
+            GeneratedKey(key=key, type=info["type"], generated_at=info["generated_at"], info=info)
+            for key, info in keys_and_info
+        ]
         
         return KeyGenerationResponse(
             keys=generated_keys,
-            total_generated=len(keys),
+            total_generated=len(generated_keys),
             key_type=request.key_type
         )
     
@@ -54,19 +46,15 @@ async def generate_keys(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate keys: {str(e)}")
 
-@router.get("/generate/{key_type}")
+@router.get("/generate/{key_type}", dependencies=[Depends(require_admin)])
 async def generate_single_key(
-    key_type: str,
-    x_admin_key: str = Header(None)
+    key_type: str
 ):
     """Generate a single API key of the specified type (quick endpoint).
     
     Args:
         key_type: Either 'web_admin' or 'tenant_id'
     """
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
-    
     if key_type not in ["web_admin", "tenant_id"]:
         raise HTTPException(
             status_code=400, 
@@ -80,7 +68,7 @@ async def generate_single_key(
         return {
             "key": key,
             "type": key_type,
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": now_iso(),
             "info": key_info
         }
     
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, HTTPException, Header, Request
-from app.core.config import settings
-from app.services.tenants import get_tenant_config
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from app.core.security import require_admin
+from app.core.responses import ORJSONResponse
+from app.services.tenants_cache import get_tenant_config_cached
+from app.services.vectorstores.milvus_store import get_milvus_retriever
 from app.utils.domains import validate_origin
 
-router = APIRouter()
+# Every route here is an admin operation
+router = APIRouter(default_response_class=ORJSONResponse, dependencies=[Depends(require_admin)])
 
 @router.get("/validate-origin-test/{tenant_id}")
-async def test_origin_validation(tenant_id: str, request: Request, x_admin_key: str = Header(None)):
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
-
-    config = get_tenant_config(tenant_id)
+async def test_origin_validation(tenant_id: str, request: Request):
+    config = await get_tenant_config_cached(tenant_id)
     if not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
@@ -22,19 +23,19 @@ async def test_origin_validation(tenant_id: str, request: Request, x_admin_key:
         "is_valid": is_valid,
     }
 @router.get("/rag/test/{tenant_id}")
-async def rag_test(tenant_id: str, x_admin_key: str = Header(None)):
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
-    cfg = get_tenant_config(tenant_id)
+async def rag_test(tenant_id: str):
+    cfg = await get_tenant_config_cached(tenant_id)
     if not cfg or not cfg.get("rag") or not cfg["rag"].get("enabled"):
         raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
     rag = cfg["rag"]
     if rag.get("provider") != "milvus":
         raise HTTPException(status_code=400, detail="Only milvus provider supported in this test")
     try:
-        from app.services.vectorstores.milvus_store import get_milvus_retriever
         milvus = rag["milvus"]
-        _ = get_milvus_retriever(
+        # get_milvus_retriever is lru_cached per connection/collection; the first call
+        # connects and loads the collection, so keep it off the event loop
+        _ = await asyncio.to_thread(
+            get_milvus_retriever,
             uri=milvus["uri"],
             token=milvus.get("token"),
             db_name=milvus.get("db_name"),
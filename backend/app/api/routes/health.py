@@ -1,14 +1,41 @@
+import asyncio
+import time
 from fastapi import APIRouter
 from app.core.redis import get_redis_client, get_conversation_redis
+from app.core.responses import ORJSONResponse
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Probe results are reused for this many seconds so liveness-probe storms cost
+# at most one Redis round trip per client per window.
+_PING_TTL_SECONDS = 5.0
+_PING_TIMEOUT_SECONDS = 2.0
+_ping_results: dict[str, tuple[float, bool]] = {}
+_ping_lock = asyncio.Lock()
+
+async def _ping(name: str, client) -> bool:
+    if client is None:
+        return False
+    cached = _ping_results.get(name)
+    if cached and time.monotonic() - cached[0] < _PING_TTL_SECONDS:
+        return cached[1]
+    async with _ping_lock:
+        cached = _ping_results.get(name)
+        if cached and time.monotonic() - cached[0] < _PING_TTL_SECONDS:
+            return cached[1]
+        try:
+            ok = bool(await asyncio.wait_for(client.ping(), _PING_TIMEOUT_SECONDS))
+        except Exception:
+            ok = False
+        _ping_results[name] = (time.monotonic(), ok)
+        return ok
 
 @router.get("/health")
 async def health_check():
-    r_main = get_redis_client()
-    r_conv = get_conversation_redis()
+    redis_config = await _ping("config", get_redis_client())
+    redis_conversations = await _ping("conversations", get_conversation_redis())
     return {
-        "status": "healthy",
-        "redis_config": r_main is not None,
-        "redis_conversations": r_conv is not None,
+        "status": "healthy" if redis_config else "degraded",
+        "redis_config": redis_config,
+        "redis_conversations": redis_conversations,
     }
\ No newline at end of file
@@ -1,28 +1,38 @@
 import asyncio
+import itertools
+import logging
+import os
+import pickle
 import tempfile
 import time
 import uuid
-from pathlib import Path
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, HTTPException, Header, UploadFile, File, Form, BackgroundTasks
-from pydantic import BaseModel
-import json, gzip, io, re
-from jsonschema import Draft7Validator, ValidationError
-
-from app.services.tenants import get_tenant_config
+from functools import lru_cache
+from typing import List, Literal, Optional, Dict, Any, Tuple, Callable, Iterator, IO
+from fastapi import APIRouter, HTTPException, Header, UploadFile, File, Form, BackgroundTasks, Depends
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+import zlib
+import aiofiles
+import ijson
+import orjson
+import fastjsonschema
+
+from app.core.responses import ORJSONResponse
+from app.services.tenants import EMBEDDING_KEY_LABELS
+from app.services.tenants_cache import ResolvedRagConfig, get_resolved_rag
 from app.services.rag_ingest import (
-    ingest_to_milvus,
     ingest_to_milvus_async,
     ingest_json_file_streaming,
     create_enhanced_chunking_config,
     estimate_processing_time
 )
-from app.services.streaming_parser import get_file_stats
+from app.services.streaming_parser import get_file_stats_stream, chunk_window_starts, _path_plan, _walk_path
 from app.services.background_tasks import get_task_manager, TaskStatus
 from app.services.checkpoint_manager import get_checkpoint_manager
 from app.services.progress_tracker import get_progress_tracker
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
 class IngestDocument(BaseModel):
     text: str
@@ -33,80 +43,416 @@ class RagIngestRequest(BaseModel):
     embedding_provider: Optional[str] = None
     embedding_model: Optional[str] = None
 
-@router.post("/rag/ingest")
-async def rag_ingest(payload: RagIngestRequest, x_tenant_id: str = Header(None)):
+async def _resolve_rag(x_tenant_id: Optional[str], require_milvus: bool = True) -> ResolvedRagConfig:
+    """Resolve the tenant's RAG settings, rejecting unknown tenants and disabled or unconfigured RAG."""
     if not x_tenant_id:
         raise HTTPException(status_code=401, detail="Tenant ID required")
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
+    rag = await get_resolved_rag(x_tenant_id)
+    if rag is None:
         raise HTTPException(status_code=404, detail="Tenant not found")
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
+    if not rag.enabled:
         raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
-    if (rag.get("provider") != "milvus") or not rag.get("milvus"):
+    if require_milvus and not rag.milvus_ready:
         raise HTTPException(status_code=400, detail="Milvus/Zilliz configuration is required")
+    return rag
+
+async def _upload_rag(x_tenant_id: str = Header(None)) -> ResolvedRagConfig:
+    """Tenant RAG settings for the upload endpoints; declared before the schema so tenant errors come first."""
+    return await _resolve_rag(x_tenant_id)
+
+def _provider_key(rag: ResolvedRagConfig, emb_provider: str) -> Optional[str]:
+    """API key for an external embedding provider (400 if the tenant has none); None for local models."""
+    label = EMBEDDING_KEY_LABELS.get(emb_provider)
+    if label is None:
+        return None
+    provider_key = rag.provider_keys.get(emb_provider)
+    if not provider_key:
+        raise HTTPException(status_code=400, detail=f"{label} embedding key missing in tenant rag.provider_keys.{emb_provider}")
+    return provider_key
 
-    emb_provider = payload.embedding_provider or rag.get("embedding_provider", "sentence_transformers")
-    emb_model = payload.embedding_model or rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
-    provider_keys = rag.get("provider_keys", {})
-    provider_key = None
-    if emb_provider == "openai":
-        provider_key = provider_keys.get("openai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="OpenAI embedding key missing in tenant rag.provider_keys.openai")
-    elif emb_provider == "voyageai":
-        provider_key = provider_keys.get("voyageai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="VoyageAI embedding key missing in tenant rag.provider_keys.voyageai")
+@router.post("/rag/ingest")
+async def rag_ingest(payload: RagIngestRequest, x_tenant_id: str = Header(None)):
+    rag = await _resolve_rag(x_tenant_id)
+
+    emb_provider = payload.embedding_provider or rag.emb_provider
+    emb_model = payload.embedding_model or rag.emb_model
+    provider_key = _provider_key(rag, emb_provider)
 
     texts = [d.text for d in payload.documents]
     metas = [d.metadata or {} for d in payload.documents]
     if not texts:
         return {"upserted": 0}
-    result = ingest_to_milvus(
+    result = await ingest_to_milvus_async(
         texts=texts,
         metadatas=metas,
-        milvus_conf=rag["milvus"],
+        milvus_conf=rag.milvus_conf,
         emb_provider=emb_provider,
         emb_model=emb_model,
         provider_key=provider_key,
+        max_concurrent_batches=_EMBED_CONCURRENCY,
     )
     return {"status": "ok", **result}
 
 # -------- File upload ingestion with schema mapping --------
 
-def _parse_dot_path(path: str, obj: Any) -> Any:
-    # Supports dot paths and [index], e.g., "items[0].content"
-    if not path:
-        return None
-    cur = obj
-    token_re = re.compile(r"\.?([^[.\]]+)|\[(\d+)\]")
-    for m in token_re.finditer(path):
-        key, idx = m.groups()
-        if key:
-            if not isinstance(cur, dict) or key not in cur:
-                return None
-            cur = cur[key]
+class UploadMapping(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    content_path: str = Field(min_length=1)
+    metadata_paths: Dict[str, Optional[str]] = {}
+
+    @field_validator("metadata_paths", mode="before")
+    @classmethod
+    def _null_as_empty(cls, v: Any) -> Any:
+        return v or {}
+
+class UploadSchema(BaseModel):
+    """schema_json form field shared by the file ingestion endpoints."""
+    model_config = ConfigDict(extra="allow")
+
+    format: Literal["json_array", "ndjson"] = "json_array"
+    validation_schema: Optional[Dict[str, Any]] = None  # JSON Schema Draft-07
+    mapping: UploadMapping
+    chunking: Optional[Dict[str, Any]] = None
+
+    @field_validator("format", mode="before")
+    @classmethod
+    def _normalize_format(cls, v: Any) -> Any:
+        if not v:
+            return "json_array"
+        return v.lower() if isinstance(v, str) else v
+
+    @field_validator("chunking", mode="before")
+    @classmethod
+    def _empty_as_default(cls, v: Any) -> Any:
+        return v or None
+
+# Messages for the schema fields clients most often get wrong
+_SCHEMA_ERRORS = {
+    ("format",): "schema_json.format must be 'json_array' or 'ndjson'",
+    ("mapping",): "schema_json.mapping.content_path is required",
+    ("mapping", "content_path"): "schema_json.mapping.content_path is required",
+}
+
+async def _parse_upload_schema(schema_json: str = Form(...)) -> UploadSchema:
+    """Parse and validate the schema_json form field once per request (400 on any problem)."""
+    logger.debug("Raw schema_json received (%d chars): %r", len(schema_json), schema_json)
+    try:
+        return UploadSchema.model_validate_json(schema_json)
+    except ValidationError as e:
+        err = e.errors(include_url=False)[0]
+        loc = tuple(err["loc"])
+        if loc in _SCHEMA_ERRORS:
+            detail = _SCHEMA_ERRORS[loc]
+        elif err["type"] == "json_invalid":
+            detail = f"schema_json must be valid JSON: {err['msg']}"
+        elif not loc:
+            detail = f"schema_json must be a JSON object: {err['msg']}"
         else:
-            i = int(idx)
-            if not isinstance(cur, list) or i >= len(cur):
-                return None
-            cur = cur[i]
-    return cur
-
-def _maybe_gzip_readall(file_bytes: bytes, filename: str) -> bytes:
-    if filename.endswith(".gz"):
-        return gzip.decompress(file_bytes)
-    # magic header check
-    if len(file_bytes) >= 2 and file_bytes[0] == 0x1F and file_bytes[1] == 0x8B:
-        return gzip.decompress(file_bytes)
-    return file_bytes
+            detail = f"Invalid schema_json.{'.'.join(map(str, loc))}: {err['msg']}"
+        logger.debug("schema_json rejected: %s", detail)
+        raise HTTPException(status_code=400, detail=detail)
+
+_UPLOAD_READ_CHUNK = 1 << 20  # 1 MiB
+# Validation stops after this many errors; only these are reported back
+_MAX_VALIDATION_ERRORS = 20
+# Chunks embedded and upserted per ingest_to_milvus_async call in rag_ingest_file
+_INGEST_BATCH = 512
+# Embedding batch requests kept in flight per ingest call
+_EMBED_CONCURRENCY = 8
+
+def _max_upload_bytes(rag: ResolvedRagConfig) -> int:
+    return rag.max_upload_mb * 1024 * 1024
+
+def _check_upload_size(size: Optional[int], max_bytes: int) -> None:
+    if size is not None and size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large: limit is {max_bytes // (1024 * 1024)} MB")
+
+def _safe_unlink(path: Optional[str]) -> None:
+    # One unlink syscall; a file already removed (or never created) is not an error
+    try:
+        os.unlink(path)
+    except (TypeError, FileNotFoundError):
+        pass
+
+async def _spool_upload(file: UploadFile, max_bytes: int) -> Tuple[str, int]:
+    """
+    Copy an upload to a named temp file in _UPLOAD_READ_CHUNK pieces; returns (path, size in bytes).
+
+    Rejects with 413 as soon as the upload is known to exceed max_bytes, before or while copying.
+    """
+    _check_upload_size(file.size, max_bytes)
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await file.read(_UPLOAD_READ_CHUNK):
+                size += len(chunk)
+                _check_upload_size(size, max_bytes)
+                await out.write(chunk)
+    except BaseException:
+        _safe_unlink(path)
+        raise
+    return path, size
+
+def _is_gzip(head: bytes) -> bool:
+    return head[:2] == b"\x1f\x8b"
+
+def _iter_upload_chunks(fileobj: IO[bytes]) -> Iterator[bytes]:
+    # Read the upload incrementally, inflating gzip on the fly (detected by magic header)
+    chunk = fileobj.read(_UPLOAD_READ_CHUNK)
+    if not _is_gzip(chunk):
+        while chunk:
+            yield chunk
+            chunk = fileobj.read(_UPLOAD_READ_CHUNK)
+        return
+    yield from _inflate_gzip(chunk, fileobj)
+
+def _inflate_gzip(first: bytes, fileobj: IO[bytes]) -> Iterator[bytes]:
+    # Inflated output is capped at _UPLOAD_READ_CHUNK per step so highly compressed uploads
+    # stay bounded in memory; concatenated gzip members are inflated back to back.
+    inflater = zlib.decompressobj(zlib.MAX_WBITS | 32)
+    chunk = first
+    while chunk:
+        data = inflater.decompress(chunk, _UPLOAD_READ_CHUNK)
+        while True:
+            if data:
+                yield data
+            if inflater.eof and _is_gzip(inflater.unused_data):
+                rest = inflater.unused_data
+                inflater = zlib.decompressobj(zlib.MAX_WBITS | 32)
+                data = inflater.decompress(rest, _UPLOAD_READ_CHUNK)
+            elif inflater.unconsumed_tail:
+                data = inflater.decompress(inflater.unconsumed_tail, _UPLOAD_READ_CHUNK)
+            else:
+                break
+        chunk = fileobj.read(_UPLOAD_READ_CHUNK)
+    tail = inflater.flush()
+    if tail:
+        yield tail
+
+def _iter_upload_records(fileobj: IO[bytes], fmt: str) -> Iterator[Any]:
+    # Lazily yield parsed records so the upload is never held decoded in memory
+    try:
+        if fmt == "json_array":
+            parsed = ijson.sendable_list()
+            parser = ijson.items_coro(parsed, "item", use_float=True)
+            started = False
+            for chunk in _iter_upload_chunks(fileobj):
+                if not started:
+                    head = chunk.lstrip()
+                    if not head:
+                        continue
+                    if head[:1] != b"[":
+                        raise ValueError("File content must be a JSON array for format=json_array")
+                    started = True
+                parser.send(chunk)
+                yield from parsed
+                del parsed[:]
+            parser.close()
+            yield from parsed
+        else:
+            # NDJSON: one JSON object per line [tinybird.co](https://www.tinybird.co/docs/guides/ingest-ndjson-data.html), [estuary.dev](https://estuary.dev/blog/json-to-bigquery/)
+            # Lines are split straight from the byte chunks; only the line spanning two chunks
+            # is joined, instead of copying the carried-over tail plus the whole next chunk
+            pending = b""
+            for chunk in _iter_upload_chunks(fileobj):
+                lines = chunk.split(b"\n")
+                if pending:
+                    lines[0] = pending + lines[0]
+                pending = lines.pop()
+                for line in lines:
+                    s = line.strip()
+                    if s:
+                        yield orjson.loads(s)
+            s = pending.strip()
+            if s:
+                yield orjson.loads(s)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+
+@lru_cache(maxsize=128)
+def _compile_validator(schema_key: bytes) -> Callable[[Any], Any]:
+    # Keyed by the canonical (sorted-keys) schema JSON so repeat uploads reuse the compiled
+    # function; use_default=False keeps items untouched and use_formats=False ignores "format"
+    # keywords, as Draft7Validator did without a format checker
+    return fastjsonschema.compile(orjson.loads(schema_key), use_default=False, use_formats=False)
+
+def _validated(records: Iterator[Any], validator: Optional[Callable[[Any], Any]]) -> Iterator[Any]:
+    """
+    Pass valid records through; once the input ends (or _MAX_VALIDATION_ERRORS is reached),
+    raise 400 if any record failed the schema.
+    """
+    if validator is None:
+        yield from records
+        return
+    errors: List[Tuple[int, fastjsonschema.JsonSchemaValueException]] = []
+    for i, it in enumerate(records):
+        try:
+            validator(it)
+        except fastjsonschema.JsonSchemaValueException as err:
+            errors.append((i, err))
+            if len(errors) >= _MAX_VALIDATION_ERRORS:
+                break
+        else:
+            yield it
+
+    if errors:
+        # Provide actionable feedback on first N errors; err.path is rooted at "data" (the item itself)
+        raise HTTPException(status_code=400, detail={"validation_errors": [
+            {"index": i, "error": err.message, "path": list(err.path[1:])} for i, err in errors
+        ]})
+
+def _make_extractor(content_path: str, metadata_paths: Dict[str, str]) -> Callable[[Any], Optional[Tuple[str, dict]]]:
+    """Build a per-record extractor returning (content, metadata), or None when content is missing/empty."""
+    # Tokenize mapping paths once for the whole upload; unmapped metadata keys stay None
+    content_plan = _path_plan(content_path)
+    meta_plans = [(k, _path_plan(p) if p else None) for k, p in metadata_paths.items()]
+
+    def extract(it: Any) -> Optional[Tuple[str, dict]]:
+        content = _walk_path(content_plan, it)
+        if not isinstance(content, str) or not content:
+            return None
+        return content, {k: _walk_path(plan, it) if plan is not None else None for k, plan in meta_plans}
+
+    return extract
+
+def _make_chunker(chunking: Dict[str, Any]) -> Callable[[str], List[str]]:
+    """Build the text splitter for a chunking config (simple char windows unless strategy is "none")."""
+    if (chunking.get("strategy") or "none").lower() == "none":
+        return lambda content: [content]
+    max_chars = max(1, int(chunking.get("max_chars", 1200)))
+    stride = max(1, max_chars - int(chunking.get("overlap", 150)))
+
+    def chunk(content: str) -> List[str]:
+        return [content[s:s + max_chars] for s in chunk_window_starts(len(content), max_chars, stride)]
+
+    return chunk
+
+def _iter_chunk_batches(
+    records: Iterator[Any],
+    content_path: str,
+    metadata_paths: Dict[str, str],
+    chunking: Dict[str, Any],
+    batch_size: int,
+) -> Iterator[Tuple[List[str], List[dict]]]:
+    """Map and chunk records into (texts, metadatas) batches of about batch_size chunks."""
+    extract = _make_extractor(content_path, metadata_paths)
+    chunk = _make_chunker(chunking)
+    # Without chunking each record is exactly one text: append it directly
+    whole = (chunking.get("strategy") or "none").lower() == "none"
+
+    texts: List[str] = []
+    metas: List[dict] = []
+    # Bound once per batch rather than looked up per record
+    texts_append, texts_extend = texts.append, texts.extend
+    metas_append, metas_extend = metas.append, metas.extend
+    # Records with equal metadata share one dict within a batch. The value type is part of the
+    # key so 1, 1.0 and True stay distinct.
+    interned: Dict[tuple, dict] = {}
+    for it in records:
+        extracted = extract(it)
+        if extracted is None:
+            # skip invalid or empty content
+            continue
+        content, md = extracted
+        try:
+            md = interned.setdefault(tuple((k, type(v), v) for k, v in md.items()), md)
+        except TypeError:
+            pass  # unhashable value (list/dict): keep the record's own dict
+        if whole:
+            texts_append(content)
+            metas_append(md)
+        else:
+            parts = chunk(content)
+            texts_extend(parts)
+            # replicate metadata per chunk (same dict reference)
+            metas_extend(itertools.repeat(md, len(parts)))
+        if len(texts) >= batch_size:
+            yield texts, metas
+            texts, metas, interned = [], [], {}
+            texts_append, texts_extend = texts.append, texts.extend
+            metas_append, metas_extend = metas.append, metas.extend
+    if texts:
+        yield texts, metas
+
+def _buffer_batches(batches: Iterator[Tuple[List[str], List[dict]]]) -> Iterator[Tuple[List[str], List[dict]]]:
+    """
+    Drain batches up front and replay them. A single batch stays in memory; larger uploads
+    are pickled batch by batch to a temp file (shared metadata dicts stay shared per batch).
+    """
+    first = next(batches, None)
+    second = next(batches, None)
+    if second is None:
+        return iter([first] if first else [])
+    spool = tempfile.TemporaryFile()
+    try:
+        for batch in itertools.chain((first, second), batches):
+            pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return _replay_batches(spool)
+
+def _replay_batches(spool: IO[bytes]) -> Iterator[Tuple[List[str], List[dict]]]:
+    with spool:
+        while True:
+            try:
+                yield pickle.load(spool)
+            except EOFError:
+                return
+
+async def _ingest_upload(
+    fileobj: IO[bytes],
+    fmt: str,
+    validator: Optional[Callable[[Any], Any]],
+    content_path: str,
+    metadata_paths: Dict[str, str],
+    chunking: Dict[str, Any],
+    **ingest_kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Validate an uploaded file, then embed and upsert it in batches of _INGEST_BATCH chunks.
+
+    The upload is parsed once, in a worker thread, validating and chunking in the same pass.
+    Batches are buffered until that pass ends (see _buffer_batches), so a malformed or invalid
+    record late in the file is rejected before anything is written, and no collection is left
+    partially ingested. Each batch then goes through ingest_to_milvus_async, which keeps up to
+    _EMBED_CONCURRENCY embedding requests in flight.
+    """
+    batches = await asyncio.to_thread(_buffer_batches, _iter_chunk_batches(
+        _validated(_iter_upload_records(fileobj, fmt), validator),
+        content_path, metadata_paths, chunking, _INGEST_BATCH,
+    ))
+
+    upserted, dim = 0, 0
+    while True:
+        batch = await asyncio.to_thread(next, batches, None)
+        if batch is None:
+            break
+        texts, metas = batch
+        try:
+            result = await ingest_to_milvus_async(
+                texts=texts, metadatas=metas, max_concurrent_batches=_EMBED_CONCURRENCY, **ingest_kwargs
+            )
+        except Exception as e:
+            if not upserted:
+                raise
+            raise HTTPException(status_code=500, detail=f"Ingestion failed after {upserted} chunks were upserted: {str(e)}")
+        upserted += result.get("upserted", 0)
+        dim = result.get("dim", dim)
+
+    if not upserted:
+        return {"upserted": 0}
+    return {"upserted": upserted, "dim": dim}
 
 @router.post("/rag/ingest-file")
 async def rag_ingest_file(
-    x_tenant_id: str = Header(None),
     file: UploadFile = File(...),
-    schema_json: str = Form(...),  # user-provided schema/mapping JSON
+    rag: ResolvedRagConfig = Depends(_upload_rag),
+    schema: UploadSchema = Depends(_parse_upload_schema),  # user-provided schema/mapping JSON
     embedding_provider: Optional[str] = Form(None),
     embedding_model: Optional[str] = Form(None)
 ):
@@ -124,161 +470,48 @@ async def rag_ingest_file(
       "chunking": { "strategy": "none" | "recursive", "max_chars": 1200, "overlap": 150 } // optional
     }
     """
-    if not x_tenant_id:
-        raise HTTPException(status_code=401, detail="Tenant ID required")
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
-        raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
-    if (rag.get("provider") != "milvus") or not rag.get("milvus"):
-        raise HTTPException(status_code=400, detail="Milvus/Zilliz configuration is required")
-
-    try:
-        print(f"[DEBUG] Raw schema_json received: {repr(schema_json)}")
-        print(f"[DEBUG] schema_json type: {type(schema_json)}")
-        
-        schema = json.loads(schema_json)
-        print(f"[DEBUG] Parsed schema type: {type(schema)}")
-        print(f"[DEBUG] Parsed schema content: {schema}")
-        
-        # Check if schema is unexpectedly a list
-        if isinstance(schema, list):
-            print(f"[DEBUG] ERROR: Schema is a list with {len(schema)} items")
-            raise HTTPException(status_code=400, detail=f"schema_json must be a JSON object, not a list. Received: {type(schema).__name__}")
-            
-    except json.JSONDecodeError as e:
-        print(f"[DEBUG] JSON decode error: {e}")
-        raise HTTPException(status_code=400, detail=f"schema_json must be valid JSON: {str(e)}")
-    except Exception as e:
-        print(f"[DEBUG] Unexpected error parsing schema: {e}")
-        raise HTTPException(status_code=400, detail=f"Error parsing schema_json: {str(e)}")
-
-    fmt = (schema.get("format") or "json_array").lower()
-    if fmt not in ("json_array", "ndjson"):
-        raise HTTPException(status_code=400, detail="schema_json.format must be 'json_array' or 'ndjson'")
-
-    validation_schema = schema.get("validation_schema")
-    mapping = schema.get("mapping") or {}
-    content_path = mapping.get("content_path")
-    metadata_paths = mapping.get("metadata_paths") or {}
-    chunking = schema.get("chunking") or {"strategy": "none"}
-
-    if not content_path:
-        raise HTTPException(status_code=400, detail="schema_json.mapping.content_path is required")
+    fmt = schema.format
+    validation_schema = schema.validation_schema
+    content_path = schema.mapping.content_path
+    metadata_paths = schema.mapping.metadata_paths
+    chunking = schema.chunking or {"strategy": "none"}
 
     # Embedding provider selection (override tenant if provided)
-    emb_provider = embedding_provider or rag.get("embedding_provider", "sentence_transformers")
-    emb_model = embedding_model or rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
-    provider_keys = rag.get("provider_keys", {})
-    provider_key = None
-    if emb_provider == "openai":
-        provider_key = provider_keys.get("openai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="OpenAI embedding key missing in tenant rag.provider_keys.openai")
-    elif emb_provider == "voyageai":
-        provider_key = provider_keys.get("voyageai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="VoyageAI embedding key missing in tenant rag.provider_keys.voyageai")
-
-    # Read file (support gz)
-    raw = await file.read()
-    raw = _maybe_gzip_readall(raw, file.filename or "")
-
-    items: List[Dict[str, Any]] = []
-    try:
-        if fmt == "json_array":
-            data = json.loads(raw.decode("utf-8"))
-            if not isinstance(data, list):
-                raise HTTPException(status_code=400, detail="File content must be a JSON array for format=json_array")
-            items = data
-        else:
-            # NDJSON: one JSON object per line [tinybird.co](https://www.tinybird.co/docs/guides/ingest-ndjson-data.html), [estuary.dev](https://estuary.dev/blog/json-to-bigquery/)
-            items = []
-            for line in io.StringIO(raw.decode("utf-8")):
-                s = line.strip()
-                if not s:
-                    continue
-                items.append(json.loads(s))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Failed to parse file: {str(e)}")
+    emb_provider = embedding_provider or rag.emb_provider
+    emb_model = embedding_model or rag.emb_model
+    provider_key = _provider_key(rag, emb_provider)
 
     # Validate items with JSON Schema if provided [json-schema.org](https://json-schema.org/), [docs.seqera.io](https://docs.seqera.io/platform-cloud/pipeline-schema/overview), [byteplus.com](https://www.byteplus.com/en/topic/542256)
+    validator = None
     if validation_schema:
         try:
-            validator = Draft7Validator(validation_schema)
+            validator = _compile_validator(orjson.dumps(validation_schema, option=orjson.OPT_SORT_KEYS))
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid validation_schema: {str(e)}")
-        errors = []
-        for i, it in enumerate(items):
-            for err in validator.iter_errors(it):
-                errors.append({"index": i, "error": err.message, "path": list(err.path)})
-        if errors:
-            # Provide actionable feedback on first N errors
-            raise HTTPException(status_code=400, detail={"validation_errors": errors[:20]})
-
-    # Extract content + metadata
-    def chunk_text(text: str) -> List[str]:
-        if not text:
-            return []
-        strat = (chunking.get("strategy") or "none").lower()
-        if strat == "none":
-            return [text]
-        # simple recursive char-based chunking
-        max_chars = int(chunking.get("max_chars", 1200))
-        overlap = int(chunking.get("overlap", 150))
-        chunks = []
-        start = 0
-        n = len(text)
-        while start < n:
-            end = min(n, start + max_chars)
-            chunks.append(text[start:end])
-            if end == n:
-                break
-            start = max(0, end - overlap)
-        return chunks
 
-    texts: List[str] = []
-    metas: List[dict] = []
-    for it in items:
-        content = _parse_dot_path(content_path, it)
-        if not isinstance(content, str):
-            # skip invalid or empty content
-            continue
-        chunks = chunk_text(content)
-        if not chunks:
-            continue
-        # build metadata from mapping paths
-        md: Dict[str, Any] = {}
-        for k, p in metadata_paths.items():
-            md[k] = _parse_dot_path(p, it)
-        # replicate metadata per chunk
-        for ch in chunks:
-            texts.append(ch)
-            metas.append(md)
-
-    if not texts:
-        return {"status": "ok", "upserted": 0}
-
-    result = ingest_to_milvus(
-        texts=texts,
-        metadatas=metas,
-        milvus_conf=rag["milvus"],
+    _check_upload_size(file.size, _max_upload_bytes(rag))
+
+    # Parse/validate/map/chunk in a worker thread, embed with bounded concurrency
+    result = await _ingest_upload(
+        file.file,
+        fmt,
+        validator,
+        content_path,
+        metadata_paths,
+        chunking,
+        milvus_conf=rag.milvus_conf,
         emb_provider=emb_provider,
         emb_model=emb_model,
         provider_key=provider_key,
-        use_batching=True  # Enable intelligent batching
     )
     return {"status": "ok", **result}
 
 
 @router.post("/rag/ingest-file-streaming")
 async def rag_ingest_file_streaming(
-    x_tenant_id: str = Header(None),
     file: UploadFile = File(...),
-    schema_json: str = Form(...),
+    rag: ResolvedRagConfig = Depends(_upload_rag),
+    schema: UploadSchema = Depends(_parse_upload_schema),
     embedding_provider: Optional[str] = Form(None),
     embedding_model: Optional[str] = Form(None),
     enable_chunking_enhancement: bool = Form(True),
@@ -299,71 +532,17 @@ async def rag_ingest_file_streaming(
       "chunking": { "strategy": "token_aware", "max_tokens": 1000, "overlap_tokens": 100 } // optional
     }
     """
-    if not x_tenant_id:
-        raise HTTPException(status_code=401, detail="Tenant ID required")
-    
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
-        raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
-    if (rag.get("provider") != "milvus") or not rag.get("milvus"):
-        raise HTTPException(status_code=400, detail="Milvus/Zilliz configuration is required")
-
-    try:
-        print(f"[DEBUG] Raw schema_json received: {repr(schema_json)}")
-        print(f"[DEBUG] schema_json type: {type(schema_json)}")
-        print(f"[DEBUG] schema_json length: {len(schema_json) if schema_json else 0}")
-        
-        schema = json.loads(schema_json)
-        print(f"[DEBUG] Parsed schema type: {type(schema)}")
-        print(f"[DEBUG] Parsed schema content: {schema}")
-        
-        # Check if schema is unexpectedly a list
-        if isinstance(schema, list):
-            print(f"[DEBUG] ERROR: Schema is a list with {len(schema)} items")
-            if schema:
-                print(f"[DEBUG] First list item: {schema[0]}")
-            raise HTTPException(status_code=400, detail=f"schema_json must be a JSON object, not a list. Received: {type(schema).__name__}")
-            
-    except json.JSONDecodeError as e:
-        print(f"[DEBUG] JSON decode error: {e}")
-        raise HTTPException(status_code=400, detail=f"schema_json must be valid JSON: {str(e)}")
-    except Exception as e:
-        print(f"[DEBUG] Unexpected error parsing schema: {e}")
-        raise HTTPException(status_code=400, detail=f"Error parsing schema_json: {str(e)}")
-
-    # Validate and enhance schema configuration
-    fmt = (schema.get("format") or "json_array").lower()
-    if fmt not in ("json_array", "ndjson"):
-        raise HTTPException(status_code=400, detail="schema_json.format must be 'json_array' or 'ndjson'")
-
-    mapping = schema.get("mapping") or {}
-    content_path = mapping.get("content_path")
-    if not content_path:
-        raise HTTPException(status_code=400, detail="schema_json.mapping.content_path is required")
+    schema_config = schema.model_dump(exclude_none=True)
 
     # Embedding provider selection
-    emb_provider = embedding_provider or rag.get("embedding_provider", "sentence_transformers")
-    emb_model = embedding_model or rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
-    provider_keys = rag.get("provider_keys", {})
-    provider_key = None
-    
-    if emb_provider == "openai":
-        provider_key = provider_keys.get("openai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="OpenAI embedding key missing in tenant rag.provider_keys.openai")
-    elif emb_provider == "voyageai":
-        provider_key = provider_keys.get("voyageai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="VoyageAI embedding key missing in tenant rag.provider_keys.voyageai")
+    emb_provider = embedding_provider or rag.emb_provider
+    emb_model = embedding_model or rag.emb_model
+    provider_key = _provider_key(rag, emb_provider)
 
     # Enhance chunking configuration for token-aware processing
     if enable_chunking_enhancement and emb_provider == "voyageai":
-        schema = create_enhanced_chunking_config(
-            schema,
+        schema_config = create_enhanced_chunking_config(
+            schema_config,
             model_name=emb_model,
             max_tokens=max_tokens_per_chunk
         )
@@ -371,31 +550,14 @@ async def rag_ingest_file_streaming(
     # Save uploaded file temporarily
     temp_file_path = None
     try:
-        # Create temporary file in BINARY mode since await file.read() returns bytes
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=".json") as temp_file:
-            temp_file_path = temp_file.name
-            content = await file.read()
-    
-            # Add debugging
-            print(f"[DEBUG] File size received: {len(content)} bytes")
-            print(f"[DEBUG] First 100 chars of content: {content[:100] if content else 'EMPTY'}")
-            
-            # Decode bytes to see actual content for debugging
-            try:
-                decoded_preview = content[:200].decode('utf-8') if content else 'EMPTY'
-                print(f"[DEBUG] Decoded preview: {decoded_preview}")
-            except:
-                print("[DEBUG] Could not decode content preview")
-    
-            temp_file.write(content)
-            temp_file.flush()  # Force flush to disk
-            # File is automatically closed when exiting the with block
+        temp_file_path, file_size = await _spool_upload(file, _max_upload_bytes(rag))
+        logger.debug("File size received: %d bytes", file_size)
 
         # Process file with streaming ingestion
         result = await ingest_json_file_streaming(
             file_path=temp_file_path,
-            schema_config=schema,
-            milvus_conf=rag["milvus"],
+            schema_config=schema_config,
+            milvus_conf=rag.milvus_conf,
             emb_provider=emb_provider,
             emb_model=emb_model,
             provider_key=provider_key
@@ -403,7 +565,7 @@ async def rag_ingest_file_streaming(
 
         # Enhanced validation - check if data was actually inserted
         if not result:
-            print(f"[ERROR] ingest_json_file_streaming returned empty result")
+            logger.error("ingest_json_file_streaming returned empty result")
             raise HTTPException(
                 status_code=500,
                 detail="Ingestion failed: No result returned from processing"
@@ -412,7 +574,7 @@ async def rag_ingest_file_streaming(
         # Check for explicit failure indicators
         if result.get("status") == "error":
             error_msg = result.get("error", "Unknown error during ingestion")
-            print(f"[ERROR] Ingestion failed: {error_msg}")
+            logger.error("Ingestion failed: %s", error_msg)
             raise HTTPException(status_code=500, detail=f"Ingestion failed: {error_msg}")
         
         # Validate that some data was actually inserted
@@ -421,7 +583,7 @@ async def rag_ingest_file_streaming(
             # Check if this is expected (empty file) or a failure
             total_processed = result.get("total_processed", 0)
             if total_processed == 0:
-                print(f"[WARNING] No items found in file to process")
+                logger.warning("No items found in file to process")
                 return {
                     "status": "ok",
                     "message": "No items found in file to process",
@@ -434,19 +596,18 @@ async def rag_ingest_file_streaming(
                     "upserted": upserted_count,
                     "error": "Processed items but failed to insert any data into Milvus"
                 }
-                print(f"[ERROR] False positive detected: {error_details}")
+                logger.error("False positive detected: %s", error_details)
                 raise HTTPException(
                     status_code=500,
                     detail=f"Ingestion failed: Processed {total_processed} items but inserted 0 records into Milvus. This indicates a connection or insertion failure."
                 )
         
-        print(f"[SUCCESS] Streaming ingestion completed: {upserted_count} items inserted")
+        logger.info("Streaming ingestion completed: %d items inserted", upserted_count)
         return {"status": "ok", **result}
 
     finally:
         # Cleanup temporary file
-        if temp_file_path and Path(temp_file_path).exists():
-            Path(temp_file_path).unlink()
+        _safe_unlink(temp_file_path)
 
 
 @router.post("/rag/analyze-file")
@@ -458,72 +619,54 @@ async def rag_analyze_file(
     Analyze JSON file to get statistics and estimates without processing.
     Useful for determining processing approach and time estimates.
     """
-    if not x_tenant_id:
-        raise HTTPException(status_code=401, detail="Tenant ID required")
+    rag = await _resolve_rag(x_tenant_id, require_milvus=False)
+
+    max_bytes = _max_upload_bytes(rag)
+    _check_upload_size(file.size, max_bytes)
+
+    # Estimate file statistics from a leading sample of the upload; when the size is unknown
+    # the rest is counted, stopping once it passes the cap
+    file_stats = await get_file_stats_stream(file, max_bytes=max_bytes)
+    _check_upload_size(file_stats["file_size_bytes"], max_bytes)
+    
+    # Get processing estimates
+    emb_provider = rag.emb_provider
+    time_estimates = estimate_processing_time(
+        file_stats["file_size_bytes"],
+        file_stats["estimated_items"],
+        emb_provider
+    )
     
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
-        raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
-
-    # Save file temporarily for analysis
-    temp_file_path = None
-    try:
-        # Create temporary file in BINARY mode
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=".json") as temp_file:
-            temp_file_path = temp_file.name
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.flush()  # Ensure content is written to disk
-
-        # Get file statistics
-        file_stats = await get_file_stats(temp_file_path)
-        
-        # Get processing estimates
-        emb_provider = rag.get("embedding_provider", "sentence_transformers")
-        time_estimates = estimate_processing_time(
-            file_stats["file_size_bytes"],
-            file_stats["estimated_items"],
-            emb_provider
-        )
-        
-        # Determine recommended processing approach
-        size_mb = file_stats["file_size_bytes"] / (1024 * 1024)
-        recommended_approach = "standard"
-        
-        if size_mb > 10:  # Files larger than 10MB
-            recommended_approach = "streaming"
-        elif file_stats["estimated_items"] > 1000:  # Many items
-            recommended_approach = "streaming"
-        
-        # Determine if batching would be beneficial
-        use_batching = emb_provider == "voyageai" and (
-            file_stats["estimated_items"] > 100 or size_mb > 1
-        )
+    # Determine recommended processing approach
+    size_mb = file_stats["file_size_bytes"] / (1024 * 1024)
+    recommended_approach = "standard"
+    
+    if size_mb > 10:  # Files larger than 10MB
+        recommended_approach = "streaming"
+    elif file_stats["estimated_items"] > 1000:  # Many items
+        recommended_approach = "streaming"
+    
+    # Determine if batching would be beneficial
+    use_batching = emb_provider == "voyageai" and (
+        file_stats["estimated_items"] > 100 or size_mb > 1
+    )
 
-        return {
-            "status": "ok",
-            "file_analysis": file_stats,
-            "processing_estimates": time_estimates,
-            "recommendations": {
-                "approach": recommended_approach,
-                "use_batching": use_batching,
-                "enable_token_aware_chunking": emb_provider == "voyageai",
-                "estimated_embedding_cost": {
-                    "note": "Estimate based on file size and provider",
-                    "provider": emb_provider,
-                    "estimated_api_calls": max(1, file_stats["estimated_items"] // 100) if emb_provider != "sentence_transformers" else 0
-                }
+    return {
+        "status": "ok",
+        "file_analysis": file_stats,
+        "processing_estimates": time_estimates,
+        "recommendations": {
+            "approach": recommended_approach,
+            "use_batching": use_batching,
+            "enable_token_aware_chunking": emb_provider == "voyageai",
+            "estimated_embedding_cost": {
+                "note": "Estimate based on file size and provider",
+                "provider": emb_provider,
+                "estimated_api_calls": max(1, file_stats["estimated_items"] // 100) if emb_provider != "sentence_transformers" else 0
             }
         }
+    }
 
-    finally:
-        # Cleanup temporary file
-        if temp_file_path and Path(temp_file_path).exists():
-            Path(temp_file_path).unlink()
 
 
 @router.get("/rag/processing-capabilities")
@@ -531,19 +674,10 @@ async def get_processing_capabilities(x_tenant_id: str = Header(None)):
     """
     Get information about available processing capabilities for this tenant.
     """
-    if not x_tenant_id:
-        raise HTTPException(status_code=401, detail="Tenant ID required")
-    
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
-        raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
+    rag = await _resolve_rag(x_tenant_id, require_milvus=False)
 
     # Get available providers and their capabilities
-    provider_keys = rag.get("provider_keys", {})
+    provider_keys = rag.provider_keys
     available_providers = ["sentence_transformers"]  # Always available
     
     if provider_keys.get("openai"):
@@ -563,14 +697,14 @@ async def get_processing_capabilities(x_tenant_id: str = Header(None)):
             "formats_supported": ["json_array", "ndjson"]
         },
         "limits": {
-            "max_file_size_mb": 1000,  # Configurable limit
+            "max_file_size_mb": rag.max_upload_mb,
             "max_tokens_per_chunk": 2000,
             "max_chunks_per_batch": 950,  # VoyageAI safety margin
             "max_tokens_per_batch": 9500  # VoyageAI safety margin
         },
         "default_settings": {
-            "embedding_provider": rag.get("embedding_provider", "sentence_transformers"),
-            "embedding_model": rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"),
+            "embedding_provider": rag.emb_provider,
+            "embedding_model": rag.emb_model,
             "chunking_strategy": "token_aware" if "voyageai" in available_providers else "recursive",
             "max_tokens_per_chunk": 1000,
             "chunk_overlap_tokens": 100
@@ -584,7 +718,8 @@ async def get_processing_capabilities(x_tenant_id: str = Header(None)):
 async def rag_ingest_file_async(
     x_tenant_id: str = Header(None),
     file: UploadFile = File(...),
-    schema_json: str = Form(...),
+    rag: ResolvedRagConfig = Depends(_upload_rag),
+    schema: UploadSchema = Depends(_parse_upload_schema),
     embedding_provider: Optional[str] = Form(None),
     embedding_model: Optional[str] = Form(None),
     enable_chunking_enhancement: bool = Form(True),
@@ -594,90 +729,31 @@ async def rag_ingest_file_async(
     Async file ingestion endpoint for large files with background processing.
     Returns a task ID for monitoring progress.
     """
-    if not x_tenant_id:
-        raise HTTPException(status_code=401, detail="Tenant ID required")
-    
-    cfg = get_tenant_config(x_tenant_id)
-    if not cfg:
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    rag = (cfg.get("rag") or {})
-    if not rag.get("enabled"):
-        raise HTTPException(status_code=400, detail="RAG not enabled for tenant")
-    if (rag.get("provider") != "milvus") or not rag.get("milvus"):
-        raise HTTPException(status_code=400, detail="Milvus/Zilliz configuration is required")
-
-    try:
-        print(f"[DEBUG] Raw schema_json received: {repr(schema_json)}")
-        print(f"[DEBUG] schema_json type: {type(schema_json)}")
-        
-        schema = json.loads(schema_json)
-        print(f"[DEBUG] Parsed schema type: {type(schema)}")
-        print(f"[DEBUG] Parsed schema content: {schema}")
-        
-        # Check if schema is unexpectedly a list
-        if isinstance(schema, list):
-            print(f"[DEBUG] ERROR: Schema is a list with {len(schema)} items")
-            raise HTTPException(status_code=400, detail=f"schema_json must be a JSON object, not a list. Received: {type(schema).__name__}")
-            
-    except json.JSONDecodeError as e:
-        print(f"[DEBUG] JSON decode error: {e}")
-        raise HTTPException(status_code=400, detail=f"schema_json must be valid JSON: {str(e)}")
-    except Exception as e:
-        print(f"[DEBUG] Unexpected error parsing schema: {e}")
-        raise HTTPException(status_code=400, detail=f"Error parsing schema_json: {str(e)}")
-
-    # Validate schema configuration
-    fmt = (schema.get("format") or "json_array").lower()
-    if fmt not in ("json_array", "ndjson"):
-        raise HTTPException(status_code=400, detail="schema_json.format must be 'json_array' or 'ndjson'")
-
-    mapping = schema.get("mapping") or {}
-    content_path = mapping.get("content_path")
-    if not content_path:
-        raise HTTPException(status_code=400, detail="schema_json.mapping.content_path is required")
+    schema_config = schema.model_dump(exclude_none=True)
 
     # Embedding provider selection
-    emb_provider = embedding_provider or rag.get("embedding_provider", "sentence_transformers")
-    emb_model = embedding_model or rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2")
-    provider_keys = rag.get("provider_keys", {})
-    provider_key = None
-    
-    if emb_provider == "openai":
-        provider_key = provider_keys.get("openai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="OpenAI embedding key missing in tenant rag.provider_keys.openai")
-    elif emb_provider == "voyageai":
-        provider_key = provider_keys.get("voyageai")
-        if not provider_key:
-            raise HTTPException(status_code=400, detail="VoyageAI embedding key missing in tenant rag.provider_keys.voyageai")
+    emb_provider = embedding_provider or rag.emb_provider
+    emb_model = embedding_model or rag.emb_model
+    provider_key = _provider_key(rag, emb_provider)
 
     # Enhance chunking configuration for token-aware processing
     if enable_chunking_enhancement and emb_provider == "voyageai":
-        schema = create_enhanced_chunking_config(
-            schema,
+        schema_config = create_enhanced_chunking_config(
+            schema_config,
             model_name=emb_model,
             max_tokens=max_tokens_per_chunk
         )
 
-    # Save uploaded file temporarily
-    temp_file_path = None
+    # Save uploaded file temporarily (oversized uploads fail here with 413)
+    temp_file_path, file_size = await _spool_upload(file, _max_upload_bytes(rag))
     try:
-        # Create temporary file in BINARY mode
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix=".json") as temp_file:
-            temp_file_path = temp_file.name
-            content = await file.read()
-            temp_file.write(content)
-            temp_file.flush()  # Ensure content is written to disk
-            file_size = len(content)
-
         # Start background task
         task_manager = get_task_manager()
         task_id = await task_manager.start_task(
             tenant_id=x_tenant_id,
             file_path=temp_file_path,
             file_size=file_size,
-            schema_config=schema,
+            schema_config=schema_config,
             embedding_provider=emb_provider,
             embedding_model=emb_model,
             provider_key=provider_key
@@ -695,8 +771,7 @@ async def rag_ingest_file_async(
 
     except Exception as e:
         # Cleanup temp file on error
-        if temp_file_path and Path(temp_file_path).exists():
-            Path(temp_file_path).unlink()
+        _safe_unlink(temp_file_path)
         raise HTTPException(status_code=500, detail=f"Failed to start background processing: {str(e)}")
 
 
@@ -864,24 +939,21 @@ async def get_active_tasks(x_tenant_id: str = Header(None)):
         raise HTTPException(status_code=401, detail="Tenant ID required")
     
     task_manager = get_task_manager()
-    active_task_ids = await task_manager.get_active_tasks()
     
-    # Filter by tenant and get task info
+    # Active task infos for this tenant, fetched with one batched lookup
     tenant_tasks = []
-    for task_id in active_task_ids:
-        task_info = await task_manager.get_task_status(task_id)
-        if task_info and task_info.tenant_id == x_tenant_id:
-            tenant_tasks.append({
-                "task_id": task_id,
-                "status": task_info.status,
-                "file_name": task_info.file_info.get("filename", "unknown"),
-                "file_size": task_info.file_info.get("file_size", 0),
-                "items_processed": task_info.progress.items_processed,
-                "items_total": task_info.progress.items_total,
-                "current_phase": task_info.progress.current_phase,
-                "start_time": task_info.progress.start_time,
-                "elapsed_time": task_info.progress.elapsed_time
-            })
+    for task_info in await task_manager.get_active_tasks_for_tenant(x_tenant_id):
+        tenant_tasks.append({
+            "task_id": task_info.task_id,
+            "status": task_info.status,
+            "file_name": task_info.file_info.get("filename", "unknown"),
+            "file_size": task_info.file_info.get("file_size", 0),
+            "items_processed": task_info.progress.items_processed,
+            "items_total": task_info.progress.items_total,
+            "current_phase": task_info.progress.current_phase,
+            "start_time": task_info.progress.start_time,
+            "elapsed_time": task_info.progress.elapsed_time
+        })
     
     return {
         "status": "ok",
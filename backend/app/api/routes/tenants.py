@@ -1,14 +1,20 @@
-from fastapi import APIRouter, HTTPException, Header
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
 from app.core.config import settings
+from app.core.security import require_admin
+from app.core.responses import ORJSONResponse
 from app.schemas.tenant import TenantRegistration, TenantUpdate
-from app.services.tenants import generate_tenant_id, get_tenant_config, save_tenant_config, new_tenant_config
+from app.services.tenants import generate_tenant_id, get_tenant_config, save_tenant_config, new_tenant_config, validate_rag
+from app.services.tenants_cache import invalidate_tenant_config
+
+logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Every route here is an admin operation
+router = APIRouter(default_response_class=ORJSONResponse, dependencies=[Depends(require_admin)])
 
 @router.post("/register-tenant")
-async def register_tenant(registration: TenantRegistration, x_admin_key: str = Header(None)):
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
+async def register_tenant(registration: TenantRegistration):
     tenant_id = generate_tenant_id()
     config = new_tenant_config(
         registration,
@@ -17,28 +23,19 @@ async def register_tenant(registration: TenantRegistration, x_admin_key: str = H
     # Add RAG config if provided (validate minimal fields when enabled)
     if registration.rag and registration.rag.enabled:
         rag = registration.rag.model_dump()
-        if rag["provider"] == "milvus":
-            milvus = rag.get("milvus") or {}
-            required = ["uri", "collection"]
-            for field in required:
-                if not milvus.get(field):
-                    raise HTTPException(status_code=400, detail=f"rag.milvus.{field} is required when RAG is enabled")
-        emb_provider = rag.get("embedding_provider", "sentence_transformers")
-        if emb_provider == "openai" and not (rag.get("provider_keys", {}).get("openai")):
-            raise HTTPException(status_code=400, detail="OpenAI embedding requires rag.provider_keys.openai")
-        if emb_provider == "voyageai" and not (rag.get("provider_keys", {}).get("voyageai")):
-            raise HTTPException(status_code=400, detail="VoyageAI embedding requires rag.provider_keys.voyageai")
+        try:
+            validate_rag(rag)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         config["rag"] = rag
 
-    save_tenant_config(tenant_id, config)
-    print(f"New tenant registered: {tenant_id} with domains: {registration.allowed_domains}")
+    await save_tenant_config(tenant_id, config)
+    logger.info("New tenant registered: %s with domains: %s", tenant_id, registration.allowed_domains)
     return {"tenant_id": tenant_id, "message": "Tenant registered successfully", "allowed_domains": registration.allowed_domains}
 
 @router.put("/update-tenant/{tenant_id}")
-async def update_tenant(tenant_id: str, update: TenantUpdate, x_admin_key: str = Header(None)):
-    if x_admin_key != settings.WEBAI_ADMIN_KEY:
-        raise HTTPException(status_code=401, detail="Invalid admin key")
-    config = get_tenant_config(tenant_id)
+async def update_tenant(tenant_id: str, update: TenantUpdate):
+    config = await get_tenant_config(tenant_id)
     if not config:
         raise HTTPException(status_code=404, detail="Tenant not found")
 
@@ -57,20 +54,16 @@ async def update_tenant(tenant_id: str, update: TenantUpdate, x_admin_key: str =
     if update.rag is not None:
         rag = update.rag.model_dump()
         if rag.get("enabled"):
-            if rag.get("provider") == "milvus":
-                milvus = rag.get("milvus") or {}
-                if not milvus.get("uri") or not milvus.get("collection"):
-                    raise HTTPException(status_code=400, detail="rag.milvus.uri and rag.milvus.collection are required when enabling RAG")
-            emb_provider = rag.get("embedding_provider", "sentence_transformers")
-            if emb_provider == "openai" and not (rag.get("provider_keys", {}).get("openai")):
-                raise HTTPException(status_code=400, detail="OpenAI embedding requires rag.provider_keys.openai")
-            if emb_provider == "voyageai" and not (rag.get("provider_keys", {}).get("voyageai")):
-                raise HTTPException(status_code=400, detail="VoyageAI embedding requires rag.provider_keys.voyageai")
+            try:
+                validate_rag(rag)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
         config["rag"] = rag
 
     # Update timestamp
     from datetime import datetime
     config["updated_at"] = datetime.utcnow().isoformat()
-    save_tenant_config(tenant_id, config)
+    await save_tenant_config(tenant_id, config)
+    invalidate_tenant_config(tenant_id)
 
-    return {"message": "Tenant updated successfully", "tenant_id": tenant_id, "updated_fields": update.dict(exclude_unset=True)}
\ No newline at end of file
+    return {"message": "Tenant updated successfully", "tenant_id": tenant_id, "updated_fields": update.model_dump(exclude_unset=True)}
\ No newline at end of file
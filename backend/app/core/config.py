@@ -1,27 +1,41 @@
-import os
+from functools import lru_cache
 from typing import Optional
-try:
-    from pydantic_settings import BaseSettings
-except ImportError:
-    # Fallback for older pydantic versions
-    from pydantic import BaseSettings
+from pydantic import Field
+from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
-    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
-    CONVERSATION_REDIS_URL: Optional[str] = os.getenv("CONVERSATION_REDIS_URL")
+    """Application settings, read once from environment variables (named after the field or its alias)."""
+
+    REDIS_URL: str = "redis://localhost:6379"
+    CONVERSATION_REDIS_URL: Optional[str] = None
+    # Connection pool size per Redis client (per worker process)
+    REDIS_MAX_CONNECTIONS: int = 100
+    # Seconds a command waits for a free pooled connection before raising
+    REDIS_POOL_TIMEOUT: float = 2.0
+    # Level for the app's own loggers (uvicorn keeps its --log-level)
+    LOG_LEVEL: str = "INFO"
+
     OPENROUTER_API_URL: str = "https://openrouter.ai/api/v1/chat/completions"
 
-    WEBAI_ADMIN_KEY: str = os.getenv("WEBAI_ADMIN_KEY", "your-secure-admin-key")
+    WEBAI_ADMIN_KEY: str = "your-secure-admin-key"
 
-    RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
-    RATE_LIMIT_PER_HOUR: int = int(os.getenv("RATE_LIMIT_PER_HOUR", "1000"))
+    RATE_LIMIT_PER_MINUTE: int = 30
+    RATE_LIMIT_PER_HOUR: int = 1000
 
-    HTTP_REFERER: str = os.getenv("OPENROUTER_HTTP_REFERER", "https://webai.chat")
-    X_TITLE: str = os.getenv("OPENROUTER_X_TITLE", "WebAI Chat Widget")
+    # Seconds a tenant config may be served from the in-process cache; also how long
+    # other workers may keep serving a config after it was saved
+    TENANT_CONFIG_CACHE_TTL: int = 30
+
+    HTTP_REFERER: str = Field("https://webai.chat", validation_alias="OPENROUTER_HTTP_REFERER")
+    X_TITLE: str = Field("WebAI Chat Widget", validation_alias="OPENROUTER_X_TITLE")
 
     # Stripe Configuration
-    STRIPE_SECRET_KEY: str = os.getenv("STRIPE_SECRET_KEY", "")
-    STRIPE_PUBLISHABLE_KEY: str = os.getenv("STRIPE_PUBLISHABLE_KEY", "")
-    STRIPE_WEBHOOK_SECRET: str = os.getenv("STRIPE_WEBHOOK_SECRET", "")
+    STRIPE_SECRET_KEY: str = ""
+    STRIPE_PUBLISHABLE_KEY: str = ""
+    STRIPE_WEBHOOK_SECRET: str = ""
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
\ No newline at end of file
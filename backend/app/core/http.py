@@ -0,0 +1,20 @@
+import httpx
+from typing import Optional
+
+_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    # One pooled client per process so outbound calls reuse keep-alive TLS connections
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=30.0,
+        )
+    return _client
+
+async def close_http_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,34 @@
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+from app.core.config import settings
+
+_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def start_logging():
+    # Log calls only enqueue the record; a listener thread does the stream writes, so a slow
+    # stdout/stderr never blocks the event loop
+    global _handler, _listener
+    if _listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream = logging.StreamHandler(sys.stderr)
+    stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())  # env values like "info" are accepted too
+    _listener.start()
+
+def stop_logging():
+    # Flushes queued records before returning
+    global _handler, _listener
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _handler = _listener = None
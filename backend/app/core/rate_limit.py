@@ -1,29 +1,84 @@
+import logging
 import time
+from dataclasses import dataclass
+from functools import lru_cache
 from app.core.redis import get_redis_client
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Two token buckets (minute and hour) stored in one hash: m/h are token counts, ts the last refill
+# time in ms. Each bucket holds up to its limit and refills continuously at limit per period, so
+# there is no burst at window boundaries. ARGV: now_ms, minute_limit, hour_limit. Status is 0
+# (allowed), 1 (minute exhausted) or 2 (hour exhausted). The key expires once both buckets would
+# be full again, which is the same as the key being absent.
+_RATE_LIMIT_LUA = """
+local now = tonumber(ARGV[1])
+local mcap = tonumber(ARGV[2])
+local hcap = tonumber(ARGV[3])
+local b = redis.call('HMGET', KEYS[1], 'm', 'h', 'ts')
+local ts = tonumber(b[3]) or now
+local elapsed = math.max(0, now - ts)
+local m = math.min(mcap, (tonumber(b[1]) or mcap) + elapsed * mcap / 60000)
+local h = math.min(hcap, (tonumber(b[2]) or hcap) + elapsed * hcap / 3600000)
+local status = 0
+if m < 1 then status = 1 elseif h < 1 then status = 2 else m = m - 1; h = h - 1 end
+redis.call('HSET', KEYS[1], 'm', tostring(m), 'h', tostring(h), 'ts', tostring(math.max(ts, now)))
+local ttl = math.max((mcap - m) * 60000 / mcap, (hcap - h) * 3600000 / hcap)
+redis.call('PEXPIRE', KEYS[1], math.ceil(ttl) + 1000)
+return {status, tostring(m), tostring(h)}
+"""
+
+@lru_cache
+def _rate_limit_script():
+    # Script objects run via EVALSHA and reload the script if Redis has dropped it
+    return get_redis_client().register_script(_RATE_LIMIT_LUA)
+
+@dataclass
+class _LocalBucket:
+    """Token counts last returned by Redis for a tenant, refilled locally until the next sync."""
+    minute_tokens: float
+    hour_tokens: float
+    synced_at: float
+
+    def estimate(self, now: float, minute_limit: int, hour_limit: int) -> tuple[float, float]:
+        elapsed = max(0.0, now - self.synced_at)
+        minute = min(minute_limit, self.minute_tokens + elapsed * minute_limit / 60)
+        hour = min(hour_limit, self.hour_tokens + elapsed * hour_limit / 3600)
+        return minute, hour
+
+_local_buckets: dict[str, _LocalBucket] = {}
+
 async def check_rate_limit(tenant_id: str, tenant_config: dict) -> tuple[bool, str]:
-    try:
-        r = get_redis_client()
-        current_minute = int(time.time() / 60)
-        current_hour = int(time.time() / 3600)
+    now = time.time()
 
-        minute_limit = tenant_config.get("rate_limit_per_minute", settings.RATE_LIMIT_PER_MINUTE)
-        hour_limit = tenant_config.get("rate_limit_per_hour", settings.RATE_LIMIT_PER_HOUR)
+    minute_limit = tenant_config.get("rate_limit_per_minute", settings.RATE_LIMIT_PER_MINUTE)
+    hour_limit = tenant_config.get("rate_limit_per_hour", settings.RATE_LIMIT_PER_HOUR)
 
-        minute_key = f"rate_limit:{tenant_id}:minute:{current_minute}"
-        minute_count = r.incr(minute_key)
-        r.expire(minute_key, 60)
-        if minute_count > minute_limit:
+    # Local pre-filter from the last synced token counts. Other processes only ever take tokens, so
+    # the local estimate is an upper bound and one below one token is a safe rejection without a
+    # Redis round trip. It can only reject: every accepted request is charged by the script, so
+    # the limit holds across any number of worker processes.
+    local = _local_buckets.get(tenant_id)
+    if local is not None:
+        minute_tokens, hour_tokens = local.estimate(now, minute_limit, hour_limit)
+        if minute_tokens < 1:
             return False, f"Rate limit exceeded: {minute_limit} requests per minute"
+        if hour_tokens < 1:
+            return False, f"Rate limit exceeded: {hour_limit} requests per hour"
 
-        hour_key = f"rate_limit:{tenant_id}:hour:{current_hour}"
-        hour_count = r.incr(hour_key)
-        r.expire(hour_key, 3600)
-        if hour_count > hour_limit:
+    try:
+        status, minute_tokens, hour_tokens = await _rate_limit_script()(
+            keys=[f"rate_limit:{tenant_id}"],
+            args=[int(now * 1000), minute_limit, hour_limit],
+        )
+        _local_buckets[tenant_id] = _LocalBucket(float(minute_tokens), float(hour_tokens), now)
+        if status == 1:
+            return False, f"Rate limit exceeded: {minute_limit} requests per minute"
+        if status == 2:
             return False, f"Rate limit exceeded: {hour_limit} requests per hour"
 
         return True, ""
     except Exception as e:
-        print(f"Rate limit check error: {e}")
+        logger.error("Rate limit check error: %s", e)
         return True, ""  # fail-open
\ No newline at end of file
@@ -1,11 +1,30 @@
-import redis
+from redis import asyncio as aioredis
 from functools import lru_cache
 from app.core.config import settings
 
+def _client(url: str, decode_responses: bool = False) -> aioredis.Redis:
+    # Blocking pool: under bursts, commands queue for a free connection instead
+    # of failing with "Too many connections".
+    pool = aioredis.BlockingConnectionPool.from_url(
+        url,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=30,
+        decode_responses=decode_responses,
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+@lru_cache
+def get_redis_client() -> aioredis.Redis:
+    return _client(settings.REDIS_URL)
+
 @lru_cache
-def get_redis_client() -> redis.Redis:
-    return redis.from_url(settings.REDIS_URL)
+def get_decoded_redis_client() -> aioredis.Redis:
+    # Same server, but replies come back as str: for callers that only store
+    # text and would otherwise decode every reply themselves.
+    return _client(settings.REDIS_URL, decode_responses=True)
 
 @lru_cache
-def get_conversation_redis() -> redis.Redis | None:
-    return redis.from_url(settings.CONVERSATION_REDIS_URL) if settings.CONVERSATION_REDIS_URL else None
\ No newline at end of file
+def get_conversation_redis() -> aioredis.Redis | None:
+    return _client(settings.CONVERSATION_REDIS_URL) if settings.CONVERSATION_REDIS_URL else None
\ No newline at end of file
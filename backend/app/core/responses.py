@@ -0,0 +1,8 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (fastapi.responses.ORJSONResponse is deprecated upstream)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
\ No newline at end of file
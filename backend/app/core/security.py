@@ -0,0 +1,14 @@
+import hmac
+from fastapi import Header, HTTPException
+from app.core.config import settings
+
+# Encoded once at import; compared in constant time on every admin request
+_ADMIN_KEY = settings.WEBAI_ADMIN_KEY.encode() if settings.WEBAI_ADMIN_KEY else b""
+
+def check_admin_key(x_admin_key: str) -> bool:
+    return bool(x_admin_key) and bool(_ADMIN_KEY) and hmac.compare_digest(x_admin_key.encode(), _ADMIN_KEY)
+
+def require_admin(x_admin_key: str = Header(None)) -> None:
+    """Route dependency rejecting requests without a valid X-Admin-Key header."""
+    if not check_admin_key(x_admin_key):
+        raise HTTPException(status_code=401, detail="Invalid admin key")
\ No newline at end of file
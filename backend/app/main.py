@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -7,8 +9,22 @@ from app.api.routes.health import router as health_router
 from app.api.routes.debug import router as debug_router
 from app.api.routes.rag import router as rag_router
 from app.api.routes.api_keys import router as api_keys_router
+from app.core.http import close_http_client
+from app.core.log import start_logging, stop_logging
+from app.core.responses import ORJSONResponse
+from app.services.background_tasks import initialize_task_manager, shutdown_task_manager
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging()
+    await initialize_task_manager()
+    yield
+    # Stops running tasks and writes their last progress before the process exits
+    await shutdown_task_manager()
+    await close_http_client()
+    stop_logging()
 
-app = FastAPI(title="WebAI API")
+app = FastAPI(title="WebAI API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS: Configured for security - credentials cannot be True with wildcard origins
 app.add_middleware(
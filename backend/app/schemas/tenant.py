@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator
-from pydantic_settings import BaseSettings
 from typing import Optional, List, Literal, Dict
+from app.utils.domains import is_valid_domain
 
 class RagMilvusConfig(BaseModel):
     uri: str
@@ -22,6 +22,16 @@ class RagConfig(BaseModel):
     provider_keys: Dict[str, str] = {}
     top_k: int = 3
 
+def _check_domains(domains: Optional[List[str]]) -> Optional[List[str]]:
+    if domains is None:
+        return domains
+    if not domains:
+        raise ValueError("At least one allowed domain is required")
+    bad = next((d for d in domains if not is_valid_domain(d)), None)
+    if bad is not None:
+        raise ValueError(f"Invalid domain: {bad}")
+    return domains
+
 class TenantRegistration(BaseModel):
     openrouter_api_key: str
     system_prompt: str
@@ -33,12 +43,7 @@ class TenantRegistration(BaseModel):
 
     @field_validator('allowed_domains')
     def validate_domains(cls, v):
-        if not v:
-            raise ValueError("At least one allowed domain is required")
-        for domain in v:
-            if not domain or domain.strip() != domain:
-                raise ValueError(f"Invalid domain: {domain}")
-        return v
+        return _check_domains(v)
 
 class TenantUpdate(BaseModel):
     system_prompt: Optional[str] = None
@@ -47,4 +52,8 @@ class TenantUpdate(BaseModel):
     rate_limit_per_minute: Optional[int] = None
     rate_limit_per_hour: Optional[int] = None
     active: Optional[bool] = None
-    rag: Optional[RagConfig] = None
\ No newline at end of file
+    rag: Optional[RagConfig] = None
+
+    @field_validator('allowed_domains')
+    def validate_domains(cls, v):
+        return _check_domains(v)
\ No newline at end of file
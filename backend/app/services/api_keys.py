@@ -1,7 +1,25 @@
+import time
 import uuid
 import secrets
 from typing import Literal
-from datetime import datetime
+from datetime import datetime, timezone
+
+# (epoch second, ISO string) of the last formatted timestamp
+_ts_cache: tuple[int, str] = (0, "")
+
+def now_iso() -> str:
+    """
+    Current UTC time as a naive ISO-8601 string, same as datetime.utcnow().isoformat().
+
+    The date/time part is formatted at most once per second; only the microseconds are
+    appended per call (omitted when zero, as isoformat does).
+    """
+    global _ts_cache
+    us = time.time_ns() // 1000
+    t, frac = divmod(us, 1_000_000)
+    if t != _ts_cache[0]:
+        _ts_cache = (t, datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None).isoformat())
+    return f"{_ts_cache[1]}.{frac:06d}" if frac else _ts_cache[1]
 
 def generate_web_admin_key() -> str:
     """Generate a web admin key in UUID format.
@@ -54,6 +72,25 @@ def generate_multiple_keys(key_type: Literal["web_admin", "tenant_id"], count: i
     
     return [generate_api_key(key_type) for _ in range(count)]
 
+def generate_multiple_keys_with_info(key_type: Literal["web_admin", "tenant_id"], count: int = 1) -> list[tuple[str, dict]]:
+    """Generate multiple API keys together with their key info.
+    
+    The type is already known, so the info is built directly instead of
+    re-analyzing each key with get_key_info.
+    
+    Args:
+        key_type: Either "web_admin" or "tenant_id"
+        count: Number of keys to generate (default: 1, max: 100)
+        
+    Returns:
+        List of (key, info) tuples
+        
+    Raises:
+        ValueError: If key_type is not supported or count is invalid
+    """
+    generated_at = now_iso()
+    return [(key, _key_info(key, key_type, generated_at)) for key in generate_multiple_keys(key_type, count)]
+
 def get_key_info(key: str) -> dict:
     """Get information about an API key.
     
@@ -63,21 +100,26 @@ def get_key_info(key: str) -> dict:
     Returns:
         Dictionary with key information
     """
+    if key.startswith("tenant_"):
+        key_type = "tenant_id"
+    elif _is_uuid_format(key):
+        key_type = "web_admin"
+    else:
+        key_type = "unknown"
+    return _key_info(key, key_type, now_iso())
+
+def _key_info(key: str, key_type: str, generated_at: str) -> dict:
+    """Build the info dict for a key of a known type."""
     info = {
         "key": key,
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": generated_at,
+        "type": key_type,
     }
-    
-    if key.startswith("tenant_"):
-        info["type"] = "tenant_id"
+    if key_type == "tenant_id":
         info["prefix"] = "tenant_"
         info["identifier"] = key[7:]  # Remove 'tenant_' prefix
-    elif _is_uuid_format(key):
-        info["type"] = "web_admin"
+    elif key_type == "web_admin":
         info["format"] = "uuid"
-    else:
-        info["type"] = "unknown"
-    
     return info
 
 def _is_uuid_format(key: str) -> bool:
@@ -4,16 +4,20 @@ Uses Redis for task queue management and status tracking.
 """
 
 import asyncio
-import json
 import logging
+import re
 import time
 import uuid
-from typing import Dict, Any, Optional, Callable, List
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Callable, List, Set
+from dataclasses import dataclass, fields
 from enum import Enum
 from pathlib import Path
 
-from app.core.redis import get_redis_client
+import orjson
+from cachetools import TTLCache
+from redis.exceptions import ResponseError
+
+from app.core.redis import get_decoded_redis_client
 from app.services.rag_ingest import ingest_json_file_streaming
 from app.services.streaming_parser import get_file_stats
 from app.services.checkpoint_manager import get_checkpoint_manager
@@ -35,7 +39,7 @@ class TaskStatus(Enum):
 # Use ProcessingPhase from progress_tracker to avoid conflicts
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskProgress:
     """Progress tracking for background tasks."""
     items_processed: int = 0
@@ -62,7 +66,7 @@ class TaskProgress:
         return time.time() - self.start_time if self.start_time > 0 else 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskInfo:
     """Complete task information."""
     task_id: str
@@ -87,27 +91,81 @@ class TaskInfo:
         self.updated_at = time.time()
 
 
+# Task info is stored as a Redis hash with one JSON-encoded value per field (progress fields
+# are flattened in). The static fields are only written when the whole hash is (re)written.
+_STATIC_TASK_FIELDS = ("task_id", "tenant_id", "file_info", "configuration", "created_at")
+_PROGRESS_FIELDS = tuple(f.name for f in fields(TaskProgress))
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value})
+# Statuses after which this process stops tracking written fields (a paused task may resume elsewhere)
+_RELEASED_STATUSES = _TERMINAL_STATUSES | {TaskStatus.PAUSED.value}
+# Task hashes expire this long after their last write
+_TASK_KEY_TTL = 48 * 3600
+# Results with more per-batch entries than this are encoded in a worker thread
+_LARGE_RESULTS_BATCHES = 64
+# Seconds to wait before each retry of a failed ingest (exponential backoff), indexed by retry count
+_RETRY_DELAYS = (0.0, 2.0, 4.0, 8.0)
+# Error messages (lowercased) containing any of these are not worth retrying
+_NON_RECOVERABLE_ERROR_RE = re.compile("|".join(map(re.escape, [
+    "file not found", "permission denied", "invalid json",
+    "schema validation", "authentication", "unauthorized",
+    "invalid key", "api key", "forbidden"
+])))
+
+
 class BackgroundTaskManager:
     """Manages background processing tasks with Redis-based queue."""
     
-    def __init__(self, redis_client=None, max_concurrent_tasks: int = 5):
+    def __init__(self, redis_client=None, max_concurrent_tasks: int = 5, flush_interval: float = 0.25):
         """
         Initialize background task manager.
         
         Args:
-            redis_client: Redis client instance
+            redis_client: Redis client instance (with decode_responses=True)
             max_concurrent_tasks: Maximum concurrent processing tasks
+            flush_interval: Seconds progress-only task info updates are collected before a background flush
         """
-        self.redis = redis_client or get_redis_client()
+        self.redis = redis_client or get_decoded_redis_client()
         self.max_concurrent_tasks = max_concurrent_tasks
+        self.flush_interval = flush_interval
+        # Tasks being processed, for pause/cancel; the dispatcher's TaskGroup owns their lifetime
         self.running_tasks: Dict[str, asyncio.Task] = {}
-        self.task_queue: asyncio.Queue = asyncio.Queue()
+        # The dispatcher takes tasks off the Redis queue while a slot is free (started lazily,
+        # since the manager may be created outside the event loop)
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
         self._shutdown = False
         
+        # Task info waiting to be written: progress ticks only mark the task dirty and the
+        # flusher writes the latest state of every dirty task in one pipeline
+        self._dirty: Set[str] = set()
+        self._task_cache: Dict[str, TaskInfo] = {}
+        # Last written non-static hash fields per task, so flushes only send what changed;
+        # tasks without an entry (or in _rewrite) get their whole hash written. Entries expire
+        # with the task key, so tasks that finish in another process don't linger here.
+        self._written: TTLCache = TTLCache(maxsize=4096, ttl=_TASK_KEY_TTL)
+        self._rewrite: Set[str] = set()
+        # TaskInfo of the tasks this manager is processing; it is the latest state of those tasks,
+        # so status reads are served from it instead of Redis
+        self._live_tasks: Dict[str, TaskInfo] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        # Set when a task is marked dirty; the flusher sleeps on it while there is nothing to write
+        self._dirty_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         # Redis key patterns
         self.TASK_KEY_PREFIX = "processing_task:"
         self.QUEUE_KEY = "task_queue"
         self.ACTIVE_TASKS_KEY = "active_tasks"
+        # Finished tasks scored by updated_at, so cleanup doesn't have to scan every task key
+        self.COMPLETED_TASKS_KEY = "tasks_by_completion"
+        self._completion_index_built = False
+        self.QUEUE_POLL_TIMEOUT = 5  # seconds a worker blocks in BRPOP before checking for shutdown
+        
+        # Progress callbacks only go on to the progress tracker once this many items or seconds
+        # have passed since the last time
+        self.PROGRESS_MIN_ITEMS = 50
+        self.PROGRESS_MIN_INTERVAL = 0.25
         
         logger.info(f"Initialized BackgroundTaskManager with max_concurrent_tasks={max_concurrent_tasks}")
     
@@ -158,14 +216,9 @@ class BackgroundTaskManager:
             }
         )
         
-        # Store in Redis
-        await self._store_task_info(task_info)
-        
-        # Add to queue
-        await self.redis.lpush(self.QUEUE_KEY, task_id)
-        
-        # Start processing if capacity available
-        await self._process_queue()
+        # Store in Redis and add to queue in one round trip; a free worker picks it up
+        self._ensure_dispatcher()
+        await self._store_task_info(task_info, extra=lambda pipe: pipe.lpush(self.QUEUE_KEY, task_id))
         
         logger.info(f"Started background task {task_id} for tenant {tenant_id}")
         return task_id
@@ -180,12 +233,65 @@ class BackgroundTaskManager:
         Returns:
             TaskInfo object or None if not found
         """
-        task_data = await self.redis.get(f"{self.TASK_KEY_PREFIX}{task_id}")
+        if task_id in self._live_tasks:
+            return self._live_tasks[task_id]
+        if task_id in self._dirty:
+            await self._flush_dirty()
+        key = f"{self.TASK_KEY_PREFIX}{task_id}"
+        try:
+            task_data = await self.redis.hgetall(key)
+        except ResponseError:
+            # Stored as a single JSON value before task info moved to hashes
+            task_data = await self.redis.get(key)
+        return self._decode_task_info(task_id, task_data)
+    
+    async def get_tasks_status(self, task_ids: List[str]) -> List[Optional[TaskInfo]]:
+        """
+        Get status for several tasks in one Redis round trip.
+        
+        Args:
+            task_ids: Task identifiers
+            
+        Returns:
+            TaskInfo (or None if not found) for each task, in the same order
+        """
+        if not task_ids:
+            return []
+        infos = {task_id: self._live_tasks[task_id] for task_id in task_ids if task_id in self._live_tasks}
+        stored_ids = [task_id for task_id in task_ids if task_id not in infos]
+        if stored_ids:
+            if not self._dirty.isdisjoint(stored_ids):
+                await self._flush_dirty()
+            
+            keys = [f"{self.TASK_KEY_PREFIX}{task_id}" for task_id in stored_ids]
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hgetall(key)
+                task_datas = await pipe.execute(raise_on_error=False)
+            for i, data in enumerate(task_datas):
+                if isinstance(data, ResponseError):
+                    # Stored as a single JSON value before task info moved to hashes
+                    task_datas[i] = await self.redis.get(keys[i])
+            for task_id, data in zip(stored_ids, task_datas):
+                infos[task_id] = self._decode_task_info(task_id, data)
+        return [infos[task_id] for task_id in task_ids]
+    
+    async def get_active_tasks_for_tenant(self, tenant_id: str) -> List[TaskInfo]:
+        """Get TaskInfo for the tenant's active tasks."""
+        infos = await self.get_tasks_status(await self.get_active_tasks())
+        return [info for info in infos if info and info.tenant_id == tenant_id]
+    
+    def _decode_task_info(self, task_id: str, task_data) -> Optional[TaskInfo]:
+        """Deserialize a stored task hash (or legacy JSON value) into a TaskInfo (None if missing or invalid)."""
         if not task_data:
             return None
         
         try:
-            data = json.loads(task_data)
+            if isinstance(task_data, dict):
+                data = {name: orjson.loads(value) for name, value in task_data.items()}
+                data['progress'] = {name: data.pop(name) for name in _PROGRESS_FIELDS if name in data}
+            else:
+                data = orjson.loads(task_data)
             # Convert progress dict back to TaskProgress object
             if 'progress' in data and isinstance(data['progress'], dict):
                 data['progress'] = TaskProgress(**data['progress'])
@@ -194,6 +300,47 @@ class BackgroundTaskManager:
             logger.error(f"Error deserializing task {task_id}: {e}")
             return None
     
+    def _encode_task_info(self, task_info: TaskInfo, include_static: bool = False) -> Dict[str, bytes]:
+        """Serialize a TaskInfo to task hash fields (the inverse of _decode_task_info)."""
+        # Built by hand rather than with asdict(), which deep-copies everything on every write
+        progress = task_info.progress
+        data = {
+            "status": task_info.status,
+            "error_info": task_info.error_info,
+            "updated_at": task_info.updated_at,
+            "items_processed": progress.items_processed,
+            "items_total": progress.items_total,
+            "chunks_processed": progress.chunks_processed,
+            "embeddings_generated": progress.embeddings_generated,
+            "bytes_processed": progress.bytes_processed,
+            "current_phase": progress.current_phase,
+            "start_time": progress.start_time,
+            "estimated_completion": progress.estimated_completion,
+            "last_checkpoint": progress.last_checkpoint,
+            "error_count": progress.error_count,
+        }
+        if include_static:
+            data.update(
+                task_id=task_info.task_id,
+                tenant_id=task_info.tenant_id,
+                file_info=task_info.file_info,
+                configuration=task_info.configuration,
+                created_at=task_info.created_at,
+            )
+        return {
+            name: orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+            for name, value in data.items()
+        }
+    
+    @staticmethod
+    def _has_large_results(task_info: TaskInfo) -> bool:
+        """Whether the task's stored ingest results are big enough to be worth encoding off the event loop."""
+        results = task_info.configuration.get("results")
+        if not isinstance(results, dict):
+            return False
+        batch_results = (results.get("statistics") or {}).get("batch_results") or ()
+        return len(batch_results) > _LARGE_RESULTS_BATCHES
+    
     async def pause_task(self, task_id: str) -> bool:
         """
         Pause a running task.
@@ -208,16 +355,15 @@ class BackgroundTaskManager:
         if not task_info or task_info.status != TaskStatus.RUNNING.value:
             return False
         
+        # Cancel the running task first so it can't queue a progress update over the new status
+        if task_id in self.running_tasks:
+            self.running_tasks[task_id].cancel()
+        
         # Update status
         task_info.status = TaskStatus.PAUSED.value
         task_info.updated_at = time.time()
         await self._store_task_info(task_info)
         
-        # Cancel the running task
-        if task_id in self.running_tasks:
-            self.running_tasks[task_id].cancel()
-            del self.running_tasks[task_id]
-        
         logger.info(f"Paused task {task_id}")
         return True
     
@@ -235,14 +381,11 @@ class BackgroundTaskManager:
         if not task_info or task_info.status != TaskStatus.PAUSED.value:
             return False
         
-        # Update status and re-queue
+        # Update status and add back to queue in one round trip
         task_info.status = TaskStatus.QUEUED.value
         task_info.updated_at = time.time()
-        await self._store_task_info(task_info)
-        
-        # Add back to queue
-        await self.redis.lpush(self.QUEUE_KEY, task_id)
-        await self._process_queue()
+        self._ensure_dispatcher()
+        await self._store_task_info(task_info, extra=lambda pipe: pipe.lpush(self.QUEUE_KEY, task_id))
         
         logger.info(f"Resumed task {task_id}")
         return True
@@ -261,26 +404,21 @@ class BackgroundTaskManager:
         if not task_info:
             return False
         
-        # Update status
-        task_info.status = TaskStatus.CANCELLED.value
-        task_info.updated_at = time.time()
-        await self._store_task_info(task_info)
-        
-        # Cancel running task if it exists
+        # Cancel running task if it exists (first, so it can't queue a progress update over the new status)
         if task_id in self.running_tasks:
             self.running_tasks[task_id].cancel()
-            del self.running_tasks[task_id]
         
-        # Remove from queue
-        await self.redis.lrem(self.QUEUE_KEY, 0, task_id)
+        # Update status and remove from queue in one round trip
+        task_info.status = TaskStatus.CANCELLED.value
+        task_info.updated_at = time.time()
+        await self._store_task_info(task_info, extra=lambda pipe: pipe.lrem(self.QUEUE_KEY, 0, task_id))
         
         logger.info(f"Cancelled task {task_id}")
         return True
     
     async def get_active_tasks(self) -> List[str]:
         """Get list of active task IDs."""
-        active_tasks = await self.redis.smembers(self.ACTIVE_TASKS_KEY)
-        return [task.decode() if isinstance(task, bytes) else task for task in active_tasks]
+        return list(await self.redis.smembers(self.ACTIVE_TASKS_KEY))
     
     async def cleanup_completed_tasks(self, max_age_hours: int = 24) -> int:
         """
@@ -293,54 +431,97 @@ class BackgroundTaskManager:
             Number of tasks cleaned up
         """
         cutoff_time = time.time() - (max_age_hours * 3600)
-        cleaned_count = 0
         
-        # Get all task keys
-        task_keys = await self.redis.keys(f"{self.TASK_KEY_PREFIX}*")
+        if not self._completion_index_built:
+            await self._build_completion_index()
         
-        for key in task_keys:
-            task_data = await self.redis.get(key)
-            if not task_data:
-                continue
-            
-            try:
-                data = json.loads(task_data)
-                status = data.get('status')
-                updated_at = data.get('updated_at', 0)
-                
-                # Remove old completed, failed, or cancelled tasks
-                if (status in [TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value] 
-                    and updated_at < cutoff_time):
-                    await self.redis.delete(key)
-                    cleaned_count += 1
-                    
-            except Exception as e:
-                logger.warning(f"Error processing task key {key} during cleanup: {e}")
+        # Remove old completed, failed, or cancelled tasks
+        task_ids = await self.redis.zrangebyscore(self.COMPLETED_TASKS_KEY, 0, cutoff_time)
+        if not task_ids:
+            logger.info("Cleaned up 0 old tasks")
+            return 0
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for task_id in task_ids:
+                pipe.delete(f"{self.TASK_KEY_PREFIX}{task_id}")
+            pipe.zrem(self.COMPLETED_TASKS_KEY, *task_ids)
+            results = await pipe.execute()
         
+        # Keys that already expired on their TTL only lose their index entry
+        cleaned_count = sum(results[:-1])
         logger.info(f"Cleaned up {cleaned_count} old tasks")
         return cleaned_count
     
-    async def _process_queue(self):
-        """Process the task queue if capacity is available."""
-        active_count = len(self.running_tasks)
-        
-        while active_count < self.max_concurrent_tasks:
-            # Get next task from queue
-            task_id = await self.redis.rpop(self.QUEUE_KEY)
-            if not task_id:
-                break
-            
-            if isinstance(task_id, bytes):
-                task_id = task_id.decode()
-            
-            # Start processing task
-            task = asyncio.create_task(self._process_task(task_id))
-            self.running_tasks[task_id] = task
-            
-            # Add to active tasks set
-            await self.redis.sadd(self.ACTIVE_TASKS_KEY, task_id)
+    async def _build_completion_index(self):
+        """Index finished tasks written before the completion index existed (once per manager)."""
+        keys = [key async for key in self.redis.scan_iter(match=f"{self.TASK_KEY_PREFIX}*", count=500)]
+        if keys:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hmget(key, "status", "updated_at")
+                task_fields = await pipe.execute(raise_on_error=False)
+            
+            finished = {}
+            for key, values in zip(keys, task_fields):
+                try:
+                    if isinstance(values, ResponseError):
+                        raise values
+                    status, updated_at = values
+                    if status is None or orjson.loads(status) not in _TERMINAL_STATUSES:
+                        continue
+                    finished[key[len(self.TASK_KEY_PREFIX):]] = orjson.loads(updated_at) if updated_at else 0
+                except Exception as e:
+                    logger.warning(f"Error processing task key {key} during cleanup: {e}")
             
-            active_count += 1
+            if finished:
+                await self.redis.zadd(self.COMPLETED_TASKS_KEY, finished)
+        self._completion_index_built = True
+    
+    def _ensure_dispatcher(self):
+        """Start the dispatcher (again, if it stopped or the event loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._shutdown:
+            return
+        if self._dispatcher is None or self._dispatcher.done() or self._dispatcher.get_loop() is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent_tasks)
+            self._dispatcher = loop.create_task(self._dispatch_loop())
+    
+    async def _dispatch_loop(self):
+        """Start queued tasks while a slot is free, blocking in BRPOP while the queue is empty."""
+        # Cancelling the dispatcher (on shutdown) cancels the running tasks and waits for them.
+        # BRPOP runs on one connection pinned for the dispatcher's lifetime instead of checking
+        # one out of the pool for every poll.
+        async with self.redis.client() as queue_conn, asyncio.TaskGroup() as group:
+            while not self._shutdown:
+                await self._slots.acquire()
+                try:
+                    item = await queue_conn.brpop(self.QUEUE_KEY, timeout=self.QUEUE_POLL_TIMEOUT)
+                except Exception as e:
+                    self._slots.release()
+                    logger.error(f"Error reading task queue: {e}")
+                    await asyncio.sleep(1)
+                    continue
+                except BaseException:
+                    self._slots.release()
+                    raise
+                if not item:
+                    self._slots.release()
+                    continue
+                
+                task_id = item[1]
+                self.running_tasks[task_id] = group.create_task(self._run_task(task_id))
+    
+    async def _run_task(self, task_id: str):
+        """Process a task in its slot, releasing the slot when it ends."""
+        try:
+            await self._process_task(task_id)
+        except Exception as e:
+            # Don't let one task's failure tear down the TaskGroup and every other task with it
+            logger.error(f"Unhandled error in task {task_id}: {e}")
+        finally:
+            if self.running_tasks.get(task_id) is asyncio.current_task():
+                del self.running_tasks[task_id]
+            self._slots.release()
     
     async def _process_task(self, task_id: str):
         """
@@ -351,6 +532,7 @@ class BackgroundTaskManager:
         """
         checkpoint_manager = get_checkpoint_manager()
         progress_tracker = get_progress_tracker()
+        task_info = None
         
         try:
             # Get task info
@@ -358,6 +540,7 @@ class BackgroundTaskManager:
             if not task_info:
                 logger.error(f"Task {task_id} not found")
                 return
+            self._live_tasks[task_id] = task_info
             
             # Check for existing checkpoint and recovery
             recovery_context = await checkpoint_manager.create_recovery_context(task_id)
@@ -368,7 +551,7 @@ class BackgroundTaskManager:
                 tenant_id=task_info.tenant_id
             )
             
-            # Update status to running
+            # Update status to running (this also adds it to the active tasks set)
             task_info.status = TaskStatus.RUNNING.value
             task_info.progress.start_time = time.time()
             await self._store_task_info(task_info)
@@ -387,6 +570,11 @@ class BackgroundTaskManager:
                 force_update=True
             )
             
+            # Items processed and time of the last progress/checkpoint pass
+            last_pass = {"items": 0, "time": 0.0}
+            # Items processed as of the newest checkpoint in Redis, so an unchanged one isn't rewritten
+            last_checkpoint = {"items": recovery_context.checkpoint.items_processed if recovery_context else None}
+            
             # Create enhanced progress callback with checkpoint support
             async def enhanced_progress_callback(processed: int, total: Optional[int] = None):
                 # Update task info
@@ -394,23 +582,48 @@ class BackgroundTaskManager:
                 if total is not None:
                     task_info.progress.items_total = total
                 task_info.updated_at = time.time()
-                await self._store_task_info(task_info)
+                self._mark_dirty(task_info)
                 
-                # Update progress tracker
-                await progress_tracker.update_progress(
-                    task_id=task_id,
-                    items_processed=processed
-                )
+                # Skip the progress and checkpoint writes until enough items or time have gone by,
+                # unless a checkpoint is due
+                checkpoint_due = processed % 100 == 0 and processed != last_checkpoint["items"]  # Every 100 items
+                now = time.monotonic()
+                if (not checkpoint_due
+                        and processed - last_pass["items"] < self.PROGRESS_MIN_ITEMS
+                        and now - last_pass["time"] < self.PROGRESS_MIN_INTERVAL):
+                    return
+                last_pass["items"] = processed
+                last_pass["time"] = now
                 
-                # Create checkpoint periodically
-                if processed % 100 == 0:  # Every 100 items
-                    await checkpoint_manager.save_checkpoint(
-                        task_id=task_id,
-                        file_path=task_info.file_info["file_path"],
-                        items_processed=processed,
-                        chunks_processed=task_info.progress.chunks_processed,
-                        embeddings_generated=task_info.progress.embeddings_generated
-                    )
+                # Progress and checkpoint writes share one round trip (none if neither is due)
+                async def write_progress():
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        # Update progress tracker
+                        await progress_tracker.update_progress(
+                            task_id=task_id,
+                            items_processed=processed,
+                            pipe=pipe
+                        )
+                        
+                        # Create checkpoint periodically
+                        if checkpoint_due:
+                            await checkpoint_manager.save_checkpoint(
+                                task_id=task_id,
+                                file_path=task_info.file_info["file_path"],
+                                items_processed=processed,
+                                chunks_processed=task_info.progress.chunks_processed,
+                                embeddings_generated=task_info.progress.embeddings_generated,
+                                pipe=pipe
+                            )
+                        
+                        await pipe.execute()
+                
+                if checkpoint_due:
+                    # A pause/cancel landing mid-write mustn't abort the checkpoint it would resume from
+                    await asyncio.shield(write_progress())
+                    last_checkpoint["items"] = processed
+                else:
+                    await write_progress()
             
             # Apply recovery if available
             items_already_processed = 0
@@ -429,7 +642,7 @@ class BackgroundTaskManager:
             await progress_tracker.update_phase(task_id, ProcessingPhase.PARSING_JSON)
             
             # Process file with streaming ingestion and enhanced error handling
-            max_retries = 3
+            max_retries = len(_RETRY_DELAYS) - 1
             retry_count = 0
             
             while retry_count <= max_retries:
@@ -451,18 +664,21 @@ class BackgroundTaskManager:
                     retry_count += 1
                     logger.warning(f"Task {task_id} failed (attempt {retry_count}/{max_retries + 1}): {e}")
                     
-                    if retry_count <= max_retries and await self._is_error_recoverable(e):
-                        # Save checkpoint before retry
-                        await checkpoint_manager.save_checkpoint(
-                            task_id=task_id,
-                            file_path=task_info.file_info["file_path"],
-                            items_processed=task_info.progress.items_processed,
-                            processing_state={"retry_count": retry_count, "last_error": str(e)},
-                            force=True
-                        )
+                    if retry_count <= max_retries and self._is_error_recoverable(e):
+                        # Save checkpoint before retry (unless no items were processed since the last one)
+                        items_processed = task_info.progress.items_processed
+                        if items_processed != last_checkpoint["items"]:
+                            await asyncio.shield(checkpoint_manager.save_checkpoint(
+                                task_id=task_id,
+                                file_path=task_info.file_info["file_path"],
+                                items_processed=items_processed,
+                                processing_state={"retry_count": retry_count, "last_error": str(e)},
+                                force=True
+                            ))
+                            last_checkpoint["items"] = items_processed
                         
                         # Exponential backoff
-                        delay = min(60.0, 2.0 ** retry_count)
+                        delay = _RETRY_DELAYS[retry_count]
                         logger.info(f"Retrying task {task_id} in {delay} seconds...")
                         await asyncio.sleep(delay)
                     else:
@@ -479,9 +695,9 @@ class BackgroundTaskManager:
             task_info.progress.embeddings_generated = result.get("upserted", 0)
             task_info.updated_at = time.time()
             
-            # Store final results
+            # Store final results (shielded: once the ingest is done, cancelling can't undo it)
             task_info.configuration["results"] = result
-            await self._store_task_info(task_info)
+            await asyncio.shield(self._store_task_info(task_info, include_static=True))
             
             # Final progress update
             await progress_tracker.finish_tracking(task_id, success=True)
@@ -495,12 +711,14 @@ class BackgroundTaskManager:
             logger.info(f"Task {task_id} was cancelled")
             await progress_tracker.finish_tracking(task_id, success=False)
             # Don't update status here - it was already set by pause/cancel
+            if self._shutdown:
+                # Interrupted by shutdown with no status write to take it out of the active set
+                await self.redis.srem(self.ACTIVE_TASKS_KEY, task_id)
             
         except Exception as e:
             logger.error(f"Error processing task {task_id}: {e}")
             
             # Update error status
-            task_info = await self.get_task_status(task_id)
             if task_info:
                 task_info.status = TaskStatus.FAILED.value
                 task_info.progress.current_phase = ProcessingPhase.ERROR.value
@@ -509,10 +727,12 @@ class BackgroundTaskManager:
                     "error_message": str(e),
                     "error_type": type(e).__name__,
                     "timestamp": time.time(),
-                    "recoverable": await self._is_error_recoverable(e)
+                    "recoverable": self._is_error_recoverable(e)
                 }
                 task_info.updated_at = time.time()
                 await self._store_task_info(task_info)
+            else:
+                await self.redis.srem(self.ACTIVE_TASKS_KEY, task_id)
             
             # Finish progress tracking with error
             await progress_tracker.finish_tracking(task_id, success=False)
@@ -527,51 +747,156 @@ class BackgroundTaskManager:
             )
         
         finally:
-            # Cleanup
-            if task_id in self.running_tasks:
-                del self.running_tasks[task_id]
-            await self.redis.srem(self.ACTIVE_TASKS_KEY, task_id)
-            
-            # Process next task in queue
-            await self._process_queue()
+            # Cleanup (the terminal status write already took it out of the active tasks set)
+            self._live_tasks.pop(task_id, None)
     
-    async def _is_error_recoverable(self, error: Exception) -> bool:
+    def _is_error_recoverable(self, error: Exception) -> bool:
         """Determine if an error is recoverable for future retry."""
-        error_str = str(error).lower()
-        
-        # Non-recoverable errors
-        non_recoverable = [
-            "file not found", "permission denied", "invalid json",
-            "schema validation", "authentication", "unauthorized",
-            "invalid key", "api key", "forbidden"
-        ]
+        return _NON_RECOVERABLE_ERROR_RE.search(str(error).lower()) is None
+    
+    async def _store_task_info(
+        self,
+        task_info: TaskInfo,
+        include_static: bool = False,
+        extra: Optional[Callable[[Any], Any]] = None
+    ):
+        """
+        Store task info in Redis now, together with any pending progress updates.
         
-        return not any(indicator in error_str for indicator in non_recoverable)
+        Args:
+            task_info: Task to store
+            include_static: Also rewrite the fields that are normally only written once (e.g. after changing configuration)
+            extra: Called with the write pipeline to queue more commands into the same round trip
+        """
+        self._task_cache[task_info.task_id] = task_info
+        self._dirty.add(task_info.task_id)
+        if include_static:
+            self._rewrite.add(task_info.task_id)
+        await self._flush_dirty(extra)
     
-    async def _store_task_info(self, task_info: TaskInfo):
-        """Store task info in Redis."""
-        # Convert to dict for JSON serialization
-        data = asdict(task_info)
-        
-        # Set TTL for 48 hours
-        await self.redis.setex(
-            f"{self.TASK_KEY_PREFIX}{task_info.task_id}",
-            48 * 3600,  # 48 hours
-            json.dumps(data, default=str)
-        )
+    def _mark_dirty(self, task_info: TaskInfo):
+        """Queue task info for the next background flush (for progress-only updates)."""
+        self._task_cache[task_info.task_id] = task_info
+        self._dirty.add(task_info.task_id)
+        self._ensure_flusher()
+        self._dirty_event.set()
+    
+    def _ensure_flusher(self):
+        """Start the flusher task (again, if it stopped or the event loop changed)."""
+        loop = self._bind_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._flusher = loop.create_task(self._flush_loop())
+    
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        """Create the flush lock and dirty event for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._flush_lock = asyncio.Lock()
+            self._dirty_event = asyncio.Event()
+        return loop
+    
+    async def _flush_loop(self):
+        """Write dirty task info once something is dirty, collecting updates for flush_interval seconds first."""
+        while not self._shutdown:
+            await self._dirty_event.wait()
+            await asyncio.sleep(self.flush_interval)
+            # Tasks marked dirty from here on set the event again for the next round
+            self._dirty_event.clear()
+            try:
+                await self._flush_dirty()
+            except Exception as e:
+                logger.error(f"Error flushing task info: {e}")
+                # The updates were kept; try again after another interval
+                self._dirty_event.set()
+    
+    async def _flush_dirty(self, extra: Optional[Callable[[Any], Any]] = None):
+        """
+        Write the latest state of every dirty task in one pipeline.
+        
+        Status changes also update the active tasks set: running tasks are added, all others removed.
+        
+        Args:
+            extra: Called with the pipeline to queue more commands into the same round trip
+        """
+        self._bind_loop()
+        
+        # The lock keeps flushes in order, so an older snapshot can't land after a newer one
+        async with self._flush_lock:
+            if not self._dirty and extra is None:
+                return
+            dirty, self._dirty = self._dirty, set()
+            tasks = {task_id: self._task_cache.pop(task_id) for task_id in dirty if task_id in self._task_cache}
+            written = {}
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for task_id, task_info in tasks.items():
+                        key = f"{self.TASK_KEY_PREFIX}{task_id}"
+                        if task_id in self._rewrite or task_id not in self._written:
+                            if self._has_large_results(task_info):
+                                # Encoding the results of a big ingest can take tens of ms; keep it off the event loop
+                                task_fields = await asyncio.to_thread(self._encode_task_info, task_info, True)
+                            else:
+                                task_fields = self._encode_task_info(task_info, include_static=True)
+                            # Replace the whole hash (this also clears a legacy JSON value)
+                            pipe.delete(key)
+                            changed = task_fields
+                        else:
+                            task_fields = self._encode_task_info(task_info)
+                            last = self._written[task_id]
+                            changed = {name: value for name, value in task_fields.items() if last.get(name) != value}
+                            if not changed:
+                                continue
+                        pipe.hset(key, mapping=changed)
+                        pipe.expire(key, _TASK_KEY_TTL)
+                        if "status" in changed:
+                            if task_info.status == TaskStatus.RUNNING.value:
+                                pipe.sadd(self.ACTIVE_TASKS_KEY, task_id)
+                            else:
+                                pipe.srem(self.ACTIVE_TASKS_KEY, task_id)
+                        if task_info.status in _TERMINAL_STATUSES:
+                            pipe.zadd(self.COMPLETED_TASKS_KEY, {task_id: task_info.updated_at})
+                        written[task_id] = task_fields
+                    if extra is not None:
+                        extra(pipe)
+                    await pipe.execute()
+            except BaseException:
+                # Keep the updates for the next flush unless a newer one has been queued
+                for task_id, task_info in tasks.items():
+                    self._task_cache.setdefault(task_id, task_info)
+                self._dirty |= dirty
+                raise
+            
+            for task_id, task_fields in written.items():
+                self._rewrite.discard(task_id)
+                if tasks[task_id].status in _RELEASED_STATUSES:
+                    self._written.pop(task_id, None)
+                else:
+                    self._written[task_id] = {
+                        name: value for name, value in task_fields.items() if name not in _STATIC_TASK_FIELDS
+                    }
     
     async def shutdown(self):
         """Shutdown the task manager gracefully."""
         self._shutdown = True
         
-        # Cancel all running tasks
-        for task_id, task in self.running_tasks.items():
-            logger.info(f"Cancelling task {task_id} during shutdown")
-            task.cancel()
-        
-        # Wait for tasks to complete
-        if self.running_tasks:
-            await asyncio.gather(*self.running_tasks.values(), return_exceptions=True)
+        # Stop taking tasks off the queue; this cancels all running tasks and waits for them
+        if self._dispatcher is not None:
+            for task_id in self.running_tasks:
+                logger.info(f"Cancelling task {task_id} during shutdown")
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        
+        # Stop the flusher and write whatever progress it hadn't flushed yet
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        try:
+            await self._flush_dirty()
+        except Exception as e:
+            logger.error(f"Error flushing task info during shutdown: {e}")
         
         logger.info("Background task manager shutdown complete")
 
@@ -592,6 +917,8 @@ async def initialize_task_manager(max_concurrent_tasks: int = 5):
     """Initialize the global task manager."""
     global _task_manager
     _task_manager = BackgroundTaskManager(max_concurrent_tasks=max_concurrent_tasks)
+    # Start the dispatcher now so tasks left queued by a previous run get picked up
+    _task_manager._ensure_dispatcher()
     return _task_manager
 
 
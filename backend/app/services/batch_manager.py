@@ -4,11 +4,11 @@ Manages batching with safety margins and adaptive sizing.
 """
 
 import asyncio
+import bisect
 import time
 import logging
 from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator
 from dataclasses import dataclass, field
-from collections import deque
 
 from .token_counter import VoyageTokenCounter, AdaptiveBatchSizer
 from .streaming_parser import ProcessedItem
@@ -29,25 +29,30 @@ class BatchItem:
 @dataclass 
 class Batch:
     """Container for a complete batch ready for API processing."""
-    items: List[BatchItem]
+    # Item fields are stored as parallel lists (one entry per item)
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
     total_tokens: int
     batch_id: str
+    source_indices: List[int] = field(default_factory=list)
+    chunk_indices: List[int] = field(default_factory=list)
+    token_counts: List[int] = field(default_factory=list)
     created_at: float = field(default_factory=time.time)
     
     @property
-    def texts(self) -> List[str]:
-        """Get list of texts from batch items."""
-        return [item.text for item in self.items]
-    
-    @property
-    def metadatas(self) -> List[Dict[str, Any]]:
-        """Get list of metadata from batch items."""
-        return [item.metadata for item in self.items]
+    def items(self) -> List[BatchItem]:
+        """Get the batch as BatchItem objects (built on access)."""
+        return [
+            BatchItem(text, metadata, source_index, chunk_index, tokens)
+            for text, metadata, source_index, chunk_index, tokens in zip(
+                self.texts, self.metadatas, self.source_indices, self.chunk_indices, self.token_counts
+            )
+        ]
     
     @property
     def size(self) -> int:
         """Get number of items in batch."""
-        return len(self.items)
+        return len(self.texts)
 
 
 @dataclass
@@ -85,11 +90,20 @@ class VoyageBatchManager:
             self.TOKEN_LIMIT = config.get("token_limit", self.TOKEN_LIMIT)
             self.CHUNK_LIMIT = config.get("chunk_limit", self.CHUNK_LIMIT)
         
-        # Current batch state
-        self.current_batch: List[BatchItem] = []
+        # Current batch state, one parallel list per item field
+        self._texts: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._source_indices: List[int] = []
+        self._chunk_indices: List[int] = []
+        self._token_counts: List[int] = []
         self.current_tokens = 0
         self.batch_counter = 0
         
+        # Texts not yet passed to the adaptive sizer (it is updated once per batch)
+        self._pending_chars = 0
+        self._pending_tokens = 0
+        self._pending_texts = 0
+        
         # Statistics
         self.stats = BatchingStats()
         
@@ -108,11 +122,11 @@ class VoyageBatchManager:
         Returns:
             True if text can be added without exceeding limits
         """
-        if not text.strip():
+        if not text or text.isspace():
             return False
         
         # Check chunk limit
-        if len(self.current_batch) >= self.CHUNK_LIMIT:
+        if len(self._texts) >= self.CHUNK_LIMIT:
             return False
         
         # Check token limit
@@ -141,17 +155,30 @@ class VoyageBatchManager:
         Returns:
             Completed batch if current batch is full, None otherwise
         """
-        if not text.strip():
+        if not text or text.isspace():
             return None
         
         # Count tokens for this text
         text_tokens = self.token_counter.count_tokens(text)
-        
-        # Update adaptive sizer statistics
-        self.adaptive_sizer.update_statistics(text, text_tokens)
-        
-        # Check if we need to complete current batch
-        if not self.can_add_item(text):
+        return self._add_counted_item(text, metadata, source_index, chunk_index, text_tokens)
+    
+    def _add_counted_item(
+        self, 
+        text: str, 
+        metadata: Dict[str, Any], 
+        source_index: int,
+        chunk_index: int,
+        text_tokens: int
+    ) -> Optional[Batch]:
+        """add_item for a non-blank text whose tokens have already been counted."""
+        # Adaptive sizer statistics, flushed when the batch completes
+        self._pending_chars += len(text)
+        self._pending_tokens += text_tokens
+        self._pending_texts += 1
+        
+        # Check if we need to complete current batch (the can_add_item limits, reusing text_tokens)
+        if (len(self._texts) >= self.CHUNK_LIMIT
+                or self.current_tokens + text_tokens > self.TOKEN_LIMIT):
             completed_batch = self._complete_current_batch()
             # Start new batch with this item
             self._add_to_current_batch(text, metadata, source_index, chunk_index, text_tokens)
@@ -187,40 +214,71 @@ class VoyageBatchManager:
         text_tokens: int
     ):
         """Add item to current batch without validation."""
-        batch_item = BatchItem(
-            text=text,
-            metadata=metadata,
-            source_index=source_index,
-            chunk_index=chunk_index,
-            estimated_tokens=text_tokens
-        )
-        
-        self.current_batch.append(batch_item)
+        self._texts.append(text)
+        self._metadatas.append(metadata)
+        self._source_indices.append(source_index)
+        self._chunk_indices.append(chunk_index)
+        self._token_counts.append(text_tokens)
         self.current_tokens += text_tokens
         self.stats.total_items_processed += 1
     
     def _complete_current_batch(self) -> Optional[Batch]:
         """Complete and return current batch."""
-        if not self.current_batch:
+        if not self._texts:
             return None
         
-        # Validate batch before completion
-        actual_tokens = self.token_counter.estimate_batch_tokens([item.text for item in self.current_batch])
+        self._flush_sizer_statistics()
+        
+        # Running sum of the tokens counted as each item was added
+        batch = self._new_batch(
+            self._texts, self._metadatas, self._source_indices, self._chunk_indices, self._token_counts,
+            self.current_tokens
+        )
+        
+        # Reset current batch (the batch keeps the old lists)
+        self._texts = []
+        self._metadatas = []
+        self._source_indices = []
+        self._chunk_indices = []
+        self._token_counts = []
+        self.current_tokens = 0
         
+        return batch
+    
+    def _flush_sizer_statistics(self):
+        """Pass the texts added since the last flush to the adaptive sizer in one update."""
+        if self._pending_texts:
+            self.adaptive_sizer.update_batch_statistics(
+                self._pending_chars, self._pending_tokens, self._pending_texts
+            )
+            self._pending_chars = 0
+            self._pending_tokens = 0
+            self._pending_texts = 0
+    
+    def _new_batch(
+        self,
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        source_indices: List[int],
+        chunk_indices: List[int],
+        token_counts: List[int],
+        total_tokens: int
+    ) -> Batch:
+        """Create the next numbered batch from item columns and record it in the statistics."""
         batch = Batch(
-            items=self.current_batch.copy(),
-            total_tokens=actual_tokens,
-            batch_id=f"batch_{self.batch_counter:06d}"
+            texts=texts,
+            metadatas=metadatas,
+            total_tokens=total_tokens,
+            batch_id=f"batch_{self.batch_counter:06d}",
+            source_indices=source_indices,
+            chunk_indices=chunk_indices,
+            token_counts=token_counts
         )
         
         # Update statistics
         self.stats.batches_created += 1
-        self.stats.total_tokens_processed += actual_tokens
+        self.stats.total_tokens_processed += total_tokens
         self._update_avg_stats()
-        
-        # Reset current batch
-        self.current_batch = []
-        self.current_tokens = 0
         self.batch_counter += 1
         
         logger.debug(
@@ -242,6 +300,10 @@ class VoyageBatchManager:
         """
         Create batches from list of texts (convenience method).
         
+        The whole list is known up front, so the texts are packed into as few batches as the
+        limits allow rather than batched in order; each batch's source_indices give the
+        positions of its texts in the list. Blank texts are skipped.
+        
         Args:
             texts: List of text strings
             metadatas: Optional list of metadata dicts
@@ -252,15 +314,93 @@ class VoyageBatchManager:
         if metadatas is None:
             metadatas = [{}] * len(texts)
         
-        for i, (text, metadata) in enumerate(zip(texts, metadatas)):
-            completed_batch = self.add_item(text, metadata, source_index=i)
-            if completed_batch:
-                yield completed_batch
+        # Count every text's tokens up front in batched tokenizer calls
+        all_token_counts = self.token_counter.count_tokens_batch(texts)
+        
+        positions = []
+        token_counts = []
+        for i, (text, text_tokens) in enumerate(zip(texts, all_token_counts)):
+            if not text or text.isspace():
+                continue
+            self._pending_chars += len(text)
+            positions.append(i)
+            token_counts.append(text_tokens)
+        self._pending_tokens += sum(token_counts)
+        self._pending_texts += len(positions)
+        self._flush_sizer_statistics()
+        self.stats.total_items_processed += len(positions)
+        
+        for bin_positions in self._pack(token_counts):
+            source_indices = [positions[p] for p in bin_positions]
+            bin_token_counts = [token_counts[p] for p in bin_positions]
+            yield self._new_batch(
+                [texts[i] for i in source_indices],
+                [metadatas[i] for i in source_indices],
+                source_indices,
+                [0] * len(source_indices),
+                bin_token_counts,
+                sum(bin_token_counts)
+            )
+    
+    def pack_items(self, items: List[BatchItem]) -> List[Batch]:
+        """
+        Pack items into as few batches as fit the token and chunk limits.
         
-        # Yield final batch if any
-        final_batch = self.finalize_batches()
-        if final_batch:
-            yield final_batch
+        Args:
+            items: Items with estimated_tokens set
+            
+        Returns:
+            Batches holding every item
+        """
+        self.stats.total_items_processed += len(items)
+        batches = []
+        for bin_positions in self._pack([item.estimated_tokens for item in items]):
+            bin_items = [items[p] for p in bin_positions]
+            token_counts = [item.estimated_tokens for item in bin_items]
+            batches.append(self._new_batch(
+                [item.text for item in bin_items],
+                [item.metadata for item in bin_items],
+                [item.source_index for item in bin_items],
+                [item.chunk_index for item in bin_items],
+                token_counts,
+                sum(token_counts)
+            ))
+        return batches
+    
+    def _pack(self, token_counts: List[int]) -> List[List[int]]:
+        """
+        Bin-pack items by token count (best-fit decreasing).
+        
+        Items are placed largest first, each into the open batch with the least room that still
+        fits it; a batch closes once it holds CHUNK_LIMIT items. An item over TOKEN_LIMIT gets a
+        batch of its own.
+        
+        Args:
+            token_counts: Token count of each item
+            
+        Returns:
+            Positions (into token_counts) of the items in each batch, ascending
+        """
+        bins: List[List[int]] = []
+        # (remaining tokens, bin index) of the batches that can take more items, kept sorted
+        open_bins: List[Tuple[int, int]] = []
+        order = sorted(range(len(token_counts)), key=token_counts.__getitem__, reverse=True)
+        
+        for position in order:
+            tokens = token_counts[position]
+            slot = bisect.bisect_left(open_bins, (tokens, -1))
+            if slot < len(open_bins):
+                remaining, bin_index = open_bins.pop(slot)
+            else:
+                remaining, bin_index = self.TOKEN_LIMIT, len(bins)
+                bins.append([])
+            bins[bin_index].append(position)
+            if len(bins[bin_index]) < self.CHUNK_LIMIT:
+                bisect.insort(open_bins, (remaining - tokens, bin_index))
+        
+        for positions in bins:
+            positions.sort()
+        return bins
     
     def estimate_batches_needed(self, texts: List[str]) -> int:
         """
@@ -276,6 +416,7 @@ class VoyageBatchManager:
             return 0
         
         # Use adaptive sizer for estimation
+        self._flush_sizer_statistics()
         estimated_capacity = self.adaptive_sizer.estimate_batch_capacity(
             texts, self.TOKEN_LIMIT, self.CHUNK_LIMIT
         )
@@ -307,7 +448,7 @@ class VoyageBatchManager:
             errors.append(f"Batch tokens {actual_tokens} exceeds 10000 token limit")
         
         # Check for empty texts
-        empty_count = sum(1 for text in batch.texts if not text.strip())
+        empty_count = sum(1 for text in batch.texts if not text or text.isspace())
         if empty_count > 0:
             errors.append(f"Batch contains {empty_count} empty texts")
         
@@ -333,6 +474,16 @@ class VoyageBatchManager:
         # Sort by token count (largest first) for better bin packing
         return sorted(items, key=lambda x: x.estimated_tokens, reverse=True)
     
+    @property
+    def current_batch(self) -> List[BatchItem]:
+        """Get the items of the batch being built (as BatchItem objects, built on access)."""
+        return [
+            BatchItem(text, metadata, source_index, chunk_index, tokens)
+            for text, metadata, source_index, chunk_index, tokens in zip(
+                self._texts, self._metadatas, self._source_indices, self._chunk_indices, self._token_counts
+            )
+        ]
+    
     def _update_avg_stats(self):
         """Update running average statistics."""
         if self.stats.batches_created > 0:
@@ -354,12 +505,13 @@ class VoyageBatchManager:
     @property
     def current_batch_info(self) -> Dict[str, Any]:
         """Get information about current batch."""
+        items_count = len(self._texts)
         return {
-            "items_count": len(self.current_batch),
+            "items_count": items_count,
             "current_tokens": self.current_tokens,
             "available_tokens": self.TOKEN_LIMIT - self.current_tokens,
-            "available_chunks": self.CHUNK_LIMIT - len(self.current_batch),
-            "can_add_more": len(self.current_batch) < self.CHUNK_LIMIT and self.current_tokens < self.TOKEN_LIMIT
+            "available_chunks": self.CHUNK_LIMIT - items_count,
+            "can_add_more": items_count < self.CHUNK_LIMIT and self.current_tokens < self.TOKEN_LIMIT
         }
 
 
@@ -449,30 +601,15 @@ class RateLimitedBatchProcessor(BatchProcessor):
         """
         super().__init__(model_name, config)
         self.requests_per_minute = requests_per_minute
-        self.request_times: deque = deque()
-        self.rate_limit_lock = asyncio.Lock()
+        # One permit per request allowed in any 60s window; each is handed back 60s after use
+        self._request_permits = asyncio.Semaphore(requests_per_minute)
     
     async def acquire_rate_limit(self):
         """Acquire permission to make API request."""
-        async with self.rate_limit_lock:
-            now = time.time()
-            
-            # Remove requests older than 1 minute
-            while self.request_times and self.request_times[0] < now - 60:
-                self.request_times.popleft()
-            
-            # Check if we can make request
-            if len(self.request_times) >= self.requests_per_minute:
-                # Calculate wait time
-                oldest_request = self.request_times[0]
-                wait_time = 60 - (now - oldest_request)
-                if wait_time > 0:
-                    logger.info(f"Rate limit reached, waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire_rate_limit()  # Recursive call after wait
-            
-            # Record this request
-            self.request_times.append(now)
+        if self._request_permits.locked():
+            logger.info("Rate limit reached, waiting for a request slot")
+        await self._request_permits.acquire()
+        asyncio.get_running_loop().call_later(60, self._request_permits.release)
 
 
 # Convenience functions
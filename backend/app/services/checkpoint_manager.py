@@ -79,7 +79,8 @@ class CheckpointManager:
         chunks_processed: int = 0,
         embeddings_generated: int = 0,
         processing_state: Optional[Dict[str, Any]] = None,
-        force: bool = False
+        force: bool = False,
+        pipe=None
     ) -> bool:
         """
         Save processing checkpoint.
@@ -93,9 +94,10 @@ class CheckpointManager:
             embeddings_generated: Number of embeddings generated
             processing_state: Additional processing state
             force: Force save even if interval not reached
+            pipe: Optional Redis pipeline to queue the write on (the caller executes it)
             
         Returns:
-            True if checkpoint was saved
+            True if checkpoint was saved (or queued on pipe)
         """
         # Check if we should save based on interval
         if not force and items_processed % self.checkpoint_interval != 0:
@@ -114,11 +116,13 @@ class CheckpointManager:
         try:
             # Store checkpoint in Redis with 7-day TTL
             checkpoint_key = f"{self.CHECKPOINT_KEY_PREFIX}{task_id}"
-            await self.redis.setex(
+            write = (self.redis if pipe is None else pipe).setex(
                 checkpoint_key,
                 7 * 24 * 3600,  # 7 days TTL
                 json.dumps(asdict(checkpoint), default=str)
             )
+            if pipe is None:
+                await write
             
             logger.debug(f"Saved checkpoint for task {task_id}: {items_processed} items")
             return True
@@ -221,23 +221,29 @@ class BatchEmbeddingService:
     async def embed_texts_with_batching(
         self,
         texts: List[str],
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_concurrent_batches: int = 8
     ) -> Tuple[List[List[float]], int]:
         """
         Embed texts with intelligent batching.
         
+        VoyageAI batching skips blank/whitespace-only texts, so they get no embedding and
+        the result is shorter than `texts`; callers that pair texts with embeddings by
+        position must filter blank texts out first.
+        
         Args:
             texts: List of texts to embed
             progress_callback: Optional callback for progress updates
+            max_concurrent_batches: Maximum number of batch requests in flight
             
         Returns:
-            Tuple of (all_embeddings, dimension)
+            Tuple of (all_embeddings, dimension), embeddings in the order of the non-blank texts
         """
         if not texts:
             return [], 0
         
         if self.provider == "voyageai":
-            return await self._embed_voyage_batched(texts, progress_callback)
+            return await self._embed_voyage_batched(texts, progress_callback, max_concurrent_batches)
         else:
             # For other providers, use existing logic
             return await self._embed_non_voyage(texts)
@@ -245,30 +251,30 @@ class BatchEmbeddingService:
     async def _embed_voyage_batched(
         self,
         texts: List[str],
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        max_concurrent_batches: int = 8
     ) -> Tuple[List[List[float]], int]:
-        """Embed texts using VoyageAI with intelligent batching."""
-        all_embeddings = []
+        """Embed texts using VoyageAI with intelligent batching, up to max_concurrent_batches at once (blank texts are dropped)."""
         total_texts = len(texts)
         processed_count = 0
-        dimension = 0
         
         # Create batches using batch manager
-        for batch in self.batch_manager.create_batches(texts):
-            logger.debug(f"Processing batch: {batch.size} items, {batch.total_tokens} tokens")
-            
-            # Embed batch with retry logic
-            batch_embeddings, dim = await self.embedder.embed_with_retry(
-                batch.texts,
-                input_type="document"
-            )
+        batches = list(self.batch_manager.create_batches(texts))
+        sem = asyncio.Semaphore(max(1, max_concurrent_batches))
+        
+        async def _one(batch: Batch) -> Tuple[List[List[float]], int]:
+            nonlocal processed_count
+            async with sem:
+                logger.debug(f"Processing batch: {batch.size} items, {batch.total_tokens} tokens")
+                
+                # Embed batch with retry logic
+                result = await self.embedder.embed_with_retry(
+                    batch.texts,
+                    input_type="document"
+                )
             
-            all_embeddings.extend(batch_embeddings)
             processed_count += len(batch.texts)
             
-            if dimension == 0:
-                dimension = dim
-            
             # Progress callback
             if progress_callback:
                 try:
@@ -276,11 +282,22 @@ class BatchEmbeddingService:
                 except Exception as e:
                     logger.warning(f"Progress callback error: {e}")
             
-            # Small delay between batches to be respectful to API
-            if processed_count < total_texts:
-                await asyncio.sleep(0.1)
+            return result
+        
+        results = await asyncio.gather(*[_one(batch) for batch in batches])
+        
+        # Batches are packed by size, not in text order: put each embedding back at its text's
+        # position (blank texts, which aren't batched, get none)
+        placed: List[Optional[List[float]]] = [None] * total_texts
+        dimension = 0
+        for batch, (batch_embeddings, dim) in zip(batches, results):
+            for source_index, embedding in zip(batch.source_indices, batch_embeddings):
+                placed[source_index] = embedding
+            if dimension == 0:
+                dimension = dim
+        all_embeddings = [embedding for embedding in placed if embedding is not None]
         
-        logger.info(f"Completed embedding {total_texts} texts in {self.batch_manager.stats.batches_created} batches")
+        logger.info(f"Completed embedding {total_texts} texts in {len(batches)} batches")
         return all_embeddings, dimension
     
     async def _embed_non_voyage(self, texts: List[str]) -> Tuple[List[List[float]], int]:
@@ -379,7 +396,8 @@ async def embed_texts_async(
     *,
     api_key: Optional[str] = None,
     mode: Literal["query", "document"] = "query",
-    progress_callback: Optional[Callable[[int, int], None]] = None
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_concurrent_batches: int = 8
 ) -> Tuple[List[List[float]], int]:
     """
     Async version of embed_texts with progress callback support.
@@ -391,6 +409,7 @@ async def embed_texts_async(
         api_key: API key for external providers
         mode: Input type ("query" or "document")
         progress_callback: Optional progress callback function
+        max_concurrent_batches: Maximum number of VoyageAI batch requests in flight
         
     Returns:
         Tuple of (embeddings, dimension)
@@ -400,7 +419,7 @@ async def embed_texts_async(
             raise ValueError("VoyageAI embedding requires api_key")
         
         service = BatchEmbeddingService(provider, model_name, api_key)
-        return await service.embed_texts_with_batching(texts, progress_callback)
+        return await service.embed_texts_with_batching(texts, progress_callback, max_concurrent_batches)
     else:
         # For other providers, run sync version in thread
         return await asyncio.to_thread(
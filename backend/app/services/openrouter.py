@@ -1,9 +1,23 @@
-from typing import List, Dict, AsyncGenerator, Optional
-import json
-import httpx
+from typing import List, Dict, AsyncGenerator, Optional, Tuple
+import orjson
 from app.core.config import settings
+from app.core.http import get_http_client
 
-async def stream_openrouter_response(messages: List[Dict], api_key: str, model: str) -> AsyncGenerator[str, None]:
+def _delta_text(payload: str) -> str:
+    # Extract choices[0].delta.content from an upstream SSE payload ("" if absent)
+    if payload == "[DONE]":
+        return ""
+    try:
+        data = orjson.loads(payload)
+        choices = data.get("choices") or []
+        if choices:
+            return choices[0].get("delta", {}).get("content") or ""
+    except Exception:
+        pass
+    return ""
+
+async def stream_openrouter_response(messages: List[Dict], api_key: str, model: str) -> AsyncGenerator[Tuple[str, str], None]:
+    # Yields (sse_frame, delta_text) so callers can accumulate the reply without re-parsing frames
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -11,15 +25,14 @@ async def stream_openrouter_response(messages: List[Dict], api_key: str, model:
         "X-Title": settings.X_TITLE,
     }
     payload = {"model": model, "messages": messages, "stream": True}
-    async with httpx.AsyncClient() as client:
-        async with client.stream("POST", settings.OPENROUTER_API_URL, headers=headers, json=payload, timeout=60.0) as response:
-            if response.status_code != 200:
-                error_data = await response.aread()
-                yield f"data: {json.dumps({'error': error_data.decode()})}\n\n"
-                return
-            async for line in response.aiter_lines():
-                if line.startswith("data: "):
-                    yield f"{line}\n\n"
+    async with get_http_client().stream("POST", settings.OPENROUTER_API_URL, headers=headers, content=orjson.dumps(payload), timeout=60.0) as response:
+        if response.status_code != 200:
+            error_data = await response.aread()
+            yield f"data: {orjson.dumps({'error': error_data.decode()}).decode()}\n\n", ""
+            return
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                yield f"{line}\n\n", _delta_text(line[6:].strip())
 
 async def chat_completion(messages: List[Dict], api_key: str, model: str, response_format: Optional[Dict] = None) -> Dict:
     headers = {
@@ -31,7 +44,6 @@ async def chat_completion(messages: List[Dict], api_key: str, model: str, respon
     payload: Dict = {"model": model, "messages": messages}
     if response_format:
         payload["response_format"] = response_format  # OpenAI-compatible; may be ignored by some models
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(settings.OPENROUTER_API_URL, headers=headers, json=payload, timeout=60.0)
-        resp.raise_for_status()
-        return resp.json()
\ No newline at end of file
+    resp = await get_http_client().post(settings.OPENROUTER_API_URL, headers=headers, content=orjson.dumps(payload), timeout=60.0)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
\ No newline at end of file
@@ -225,7 +225,8 @@ class ProgressTracker:
         vectors_stored: Optional[int] = None,
         bytes_processed: Optional[int] = None,
         errors_encountered: Optional[int] = None,
-        force_update: bool = False
+        force_update: bool = False,
+        pipe=None
     ) -> bool:
         """
         Update progress counters.
@@ -239,6 +240,7 @@ class ProgressTracker:
             bytes_processed: Number of bytes processed
             errors_encountered: Number of errors encountered
             force_update: Force update even if interval not reached
+            pipe: Optional Redis pipeline to queue the write on (the caller executes it)
             
         Returns:
             True if update was successful
@@ -282,7 +284,7 @@ class ProgressTracker:
         await self._update_time_estimates(progress_stats)
         
         progress_stats.last_update = time.time()
-        await self._store_progress(progress_stats)
+        await self._store_progress(progress_stats, pipe)
         
         return True
     
@@ -500,8 +502,8 @@ class ProgressTracker:
             logger.error(f"Failed to load progress for task {task_id}: {e}")
             return None
     
-    async def _store_progress(self, progress_stats: ProgressStatistics):
-        """Store progress stats to Redis."""
+    async def _store_progress(self, progress_stats: ProgressStatistics, pipe=None):
+        """Store progress stats to Redis (or queue the write on pipe)."""
         try:
             progress_key = f"{self.PROGRESS_KEY_PREFIX}{progress_stats.task_id}"
             
@@ -509,11 +511,13 @@ class ProgressTracker:
             data = asdict(progress_stats)
             
             # Set TTL for 7 days
-            await self.redis.setex(
+            write = (self.redis if pipe is None else pipe).setex(
                 progress_key,
                 7 * 24 * 3600,  # 7 days TTL
                 json.dumps(data, default=str)
             )
+            if pipe is None:
+                await write
             
         except Exception as e:
             logger.error(f"Failed to store progress for task {progress_stats.task_id}: {e}")
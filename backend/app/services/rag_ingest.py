@@ -1,9 +1,10 @@
 import asyncio
+import inspect
 import tempfile
-import json
+import orjson
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Callable, AsyncIterator, Union
+from typing import List, Dict, Optional, Callable, AsyncIterator, Tuple, Union
 from dataclasses import dataclass
 
 from app.services.embeddings import embed_texts, embed_texts_async, BatchEmbeddingService
@@ -26,6 +27,63 @@ class IngestStats:
     errors_encountered: int = 0
 
 
+def _encode_metadatas(metadatas: Optional[List[dict]], count: int) -> List[str]:
+    """
+    JSON-encode the metadata for each of `count` texts, once per distinct dict object.
+
+    Chunks of one document share a single metadata dict, so its encoded string is
+    reused for every chunk instead of being serialized again. Missing/empty -> "{}".
+    """
+    metadatas = metadatas or []
+    encoded: Dict[int, str] = {}
+    out: List[str] = []
+    for i in range(count):
+        md = metadatas[i] if i < len(metadatas) else None
+        if not md:
+            out.append("{}")
+            continue
+        s = encoded.get(id(md))
+        if s is None:
+            s = encoded[id(md)] = orjson.dumps(md).decode()
+        out.append(s)
+    return out
+
+
+def _drop_blank_texts(texts: List[str], encoded: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Drop blank/whitespace-only texts together with their encoded metadata.
+
+    The batched VoyageAI embedder returns no vector for blank texts, so they are
+    filtered before embedding to keep texts and vectors aligned one to one.
+    """
+    if not any(not t or t.isspace() for t in texts):
+        return texts, encoded
+    keep = [i for i, t in enumerate(texts) if t and not t.isspace()]
+    logger.debug(f"Skipping {len(texts) - len(keep)} blank texts")
+    return [texts[i] for i in keep], [encoded[i] for i in keep]
+
+
+def _length_order(texts: List[str]) -> Optional[List[int]]:
+    """
+    Indices of `texts` sorted by length, or None if they are already in that order.
+
+    Embedding length-sorted batches keeps items of similar size together, so a batch
+    is not padded to (or held back by) one much longer text.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    if all(i == pos for pos, i in enumerate(order)):
+        return None
+    return order
+
+
+def _unsort(values: List, order: List[int]) -> List:
+    """Put values computed for the texts at `order` back at their original positions."""
+    out = [None] * len(values)
+    for pos, i in enumerate(order):
+        out[i] = values[pos]
+    return out
+
+
 def ingest_to_milvus(
     *,
     texts: List[str],
@@ -56,6 +114,10 @@ def ingest_to_milvus(
     
     logger.info(f"Ingesting {len(texts)} texts using {emb_provider}/{emb_model}")
     
+    texts, encoded = _drop_blank_texts(texts, _encode_metadatas(metadatas, len(texts)))
+    if not texts:
+        return {"upserted": 0, "dim": 0}
+    
     # Embed texts (with batching if using VoyageAI)
     vecs, dim = embed_texts(
         provider=emb_provider,
@@ -80,14 +142,7 @@ def ingest_to_milvus(
     )
 
     # Prepare rows for insertion
-    rows = []
-    for i, t in enumerate(texts):
-        row = {"text": t, "embedding": vecs[i]}
-        if metadatas and i < len(metadatas):
-            row["metadata"] = json.dumps(metadatas[i] or {}, ensure_ascii=False)
-        else:
-            row["metadata"] = json.dumps({}, ensure_ascii=False)
-        rows.append(row)
+    rows = [{"text": t, "embedding": vecs[i], "metadata": encoded[i]} for i, t in enumerate(texts)]
 
     # Insert into Milvus
     upsert_texts(
@@ -115,7 +170,9 @@ async def ingest_to_milvus_async(
     emb_provider: str,
     emb_model: str,
     provider_key: Optional[str],
-    progress_callback: Optional[Callable[[int, int], None]] = None
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    max_concurrent_batches: int = 8,
+    sort_by_length: bool = True
 ) -> Dict:
     """
     Async version of ingest_to_milvus with progress tracking.
@@ -128,6 +185,8 @@ async def ingest_to_milvus_async(
         emb_model: Embedding model name
         provider_key: API key for provider
         progress_callback: Optional progress callback
+        max_concurrent_batches: Maximum number of embedding batch requests in flight
+        sort_by_length: Embed texts in length order (results are mapped back to input order)
         
     Returns:
         Dictionary with ingestion results
@@ -137,15 +196,33 @@ async def ingest_to_milvus_async(
     
     logger.info(f"Async ingesting {len(texts)} texts using {emb_provider}/{emb_model}")
     
+    texts, encoded = _drop_blank_texts(texts, _encode_metadatas(metadatas, len(texts)))
+    if not texts:
+        return {"upserted": 0, "dim": 0}
+    
+    # Identical chunks (boilerplate, repeated paragraphs) are embedded once
+    slots: Dict[str, int] = {}
+    slot_of = [slots.setdefault(t, len(slots)) for t in texts]
+    unique = list(slots) if len(slots) < len(texts) else texts
+    if unique is not texts:
+        logger.debug(f"Embedding {len(unique)} unique of {len(texts)} texts")
+
+    order = _length_order(unique) if sort_by_length else None
+
     # Embed texts with progress tracking
     vecs, dim = await embed_texts_async(
         provider=emb_provider,
         model_name=emb_model,
-        texts=texts,
+        texts=[unique[i] for i in order] if order else unique,
         api_key=provider_key,
         mode="document",
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        max_concurrent_batches=max_concurrent_batches
     )
+    if order:
+        vecs = _unsort(vecs, order)
+    if unique is not texts:
+        vecs = [vecs[i] for i in slot_of]
 
     # Ensure collection exists
     await asyncio.to_thread(
@@ -162,14 +239,7 @@ async def ingest_to_milvus_async(
     )
 
     # Prepare rows for insertion
-    rows = []
-    for i, t in enumerate(texts):
-        row = {"text": t, "embedding": vecs[i]}
-        if metadatas and i < len(metadatas):
-            row["metadata"] = json.dumps(metadatas[i] or {}, ensure_ascii=False)
-        else:
-            row["metadata"] = json.dumps({}, ensure_ascii=False)
-        rows.append(row)
+    rows = [{"text": t, "embedding": vecs[i], "metadata": encoded[i]} for i, t in enumerate(texts)]
 
     # Insert into Milvus
     await asyncio.to_thread(
@@ -306,7 +376,9 @@ async def ingest_json_file_streaming(
                 
                 # Progress callback
                 if progress_callback:
-                    progress_callback(stats.total_chunks_created, None)  # Total unknown in streaming
+                    pending = progress_callback(stats.total_chunks_created, None)  # Total unknown in streaming
+                    if inspect.isawaitable(pending):
+                        await pending
         
         # Process final batch if any items remain
         if text_batch:
@@ -428,6 +500,11 @@ async def _process_text_batch(
     
     logger.info(f"Processing batch with {len(texts)} texts")
     
+    texts, encoded = _drop_blank_texts(texts, _encode_metadatas(metadatas, len(texts)))
+    if not texts:
+        logger.warning("No valid rows to insert after filtering")
+        return {"upserted": 0, "dim": collection_dim or 0, "status": "no_valid_data"}
+    
     try:
         # Embed texts with error checking
         logger.debug("Starting embedding generation...")
@@ -464,22 +541,7 @@ async def _process_text_batch(
         
         # Prepare rows for insertion
         logger.debug("Preparing data rows for insertion...")
-        rows = []
-        for i, text in enumerate(texts):
-            if not text or not text.strip():
-                logger.warning(f"Skipping empty text at index {i}")
-                continue
-                
-            row = {
-                "text": text,
-                "embedding": vecs[i],
-                "metadata": json.dumps(metadatas[i] if i < len(metadatas) else {}, ensure_ascii=False)
-            }
-            rows.append(row)
-        
-        if not rows:
-            logger.warning("No valid rows to insert after filtering")
-            return {"upserted": 0, "dim": dim, "status": "no_valid_data"}
+        rows = [{"text": t, "embedding": vecs[i], "metadata": encoded[i]} for i, t in enumerate(texts)]
         
         # Insert to Milvus with validation
         logger.info(f"Inserting {len(rows)} rows to Milvus...")
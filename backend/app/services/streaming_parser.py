@@ -3,12 +3,14 @@ Streaming JSON parser for memory-efficient processing of large JSON files.
 Supports JSON arrays, NDJSON, and gzip compression.
 """
 
+import io
 import ijson
 import gzip
-import json
+import zlib
+import orjson
 import re
 import logging
-from typing import AsyncIterator, Dict, Any, IO, List, Optional, Union
+from typing import AsyncIterator, Dict, Any, IO, List, Optional, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
 # import aiofiles  # Optional dependency - will be imported when needed
@@ -16,6 +18,49 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 
+_TOKEN_RE = re.compile(r"\.?([^[.\]]+)|\[(\d+)\]")
+# Tokenized dot-paths, shared across processors; mapped paths repeat across uploads
+_PATH_PLANS: Dict[str, Tuple[Tuple[Optional[str], Optional[int]], ...]] = {}
+_MAX_PATH_PLANS = 4096
+
+
+def _path_plan(path: str) -> Tuple[Tuple[Optional[str], Optional[int]], ...]:
+    """Tokenize a dot-path like 'items[0].content' into (key, index) steps, once per distinct path."""
+    plan = _PATH_PLANS.get(path)
+    if plan is None:
+        if len(_PATH_PLANS) >= _MAX_PATH_PLANS:
+            _PATH_PLANS.clear()
+        plan = _PATH_PLANS[path] = tuple(
+            (key, None) if key else (None, int(idx)) for key, idx in (m.groups() for m in _TOKEN_RE.finditer(path))
+        )
+    return plan
+
+
+def _walk_path(plan: Tuple[Tuple[Optional[str], Optional[int]], ...], obj: Any) -> Any:
+    """Follow tokenized path steps through nested dicts/lists; None if any step is missing."""
+    current = obj
+    for key, index in plan:
+        if key is not None:
+            # Object key access
+            if not isinstance(current, dict) or key not in current:
+                return None
+            current = current[key]
+        else:
+            # Array index access
+            if not isinstance(current, list) or index >= len(current):
+                return None
+            current = current[index]
+    return current
+
+
+def chunk_window_starts(n: int, max_chars: int, stride: int) -> range:
+    """Start offsets of overlapping char windows over n chars; the last window is the first one reaching n.
+
+    Starts stay below n, so a stride wider than max_chars (negative overlap) never yields an empty tail.
+    """
+    return range(0, max(min(max(n - max_chars, 0) + stride, n), 1), stride)
+
+
 @dataclass
 class ProcessedItem:
     """Container for processed JSON item with extracted content and metadata."""
@@ -53,6 +98,14 @@ class StreamingJSONProcessor:
         self.content_path = self.mapping.get("content_path", "")
         self.metadata_paths = self.mapping.get("metadata_paths", {})
         
+        # Dot-paths are tokenized once here, not per item
+        self._content_plan = _path_plan(self.content_path) if self.content_path else ()
+        self._metadata_plans = [(key, _path_plan(path)) for key, path in self.metadata_paths.items() if path]
+        
+        # Char-window parameters are fixed for the whole stream
+        self.max_chars = max(1, int(self.chunking.get("max_chars", 1200)))
+        self.stride = max(1, self.max_chars - int(self.chunking.get("overlap", 150)))
+        
         self.stats = StreamingStats()
         
         # Validate configuration
@@ -167,13 +220,13 @@ class StreamingJSONProcessor:
                     continue
                 
                 try:
-                    item = json.loads(line)
+                    item = orjson.loads(line)
                     async for processed in self._process_item(item, item_index):
                         yield processed
                     item_index += 1
                     self.stats.items_processed += 1
                     
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.warning(f"Invalid JSON on line {item_index + 1}: {e}")
                     self.stats.errors_encountered += 1
                     continue
@@ -250,15 +303,15 @@ class StreamingJSONProcessor:
         """
         try:
             # Extract content using dot-path
-            content = self._parse_dot_path(self.content_path, item)
+            content = _walk_path(self._content_plan, item)
             if not isinstance(content, str) or not content.strip():
                 # Skip items without valid content
                 return
             
             # Extract metadata
-            metadata = {}
-            for key, path in self.metadata_paths.items():
-                metadata[key] = self._parse_dot_path(path, item)
+            metadata = dict.fromkeys(self.metadata_paths)
+            for key, plan in self._metadata_plans:
+                metadata[key] = _walk_path(plan, item)
             
             # Add source tracking
             metadata["_source_index"] = item_index
@@ -291,30 +344,7 @@ class StreamingJSONProcessor:
         if not path or obj is None:
             return None
         
-        current = obj
-        # Enhanced regex to handle array indices
-        token_re = re.compile(r"\.?([^[.\]]+)|\[(\d+)\]")
-        
-        try:
-            for match in token_re.finditer(path):
-                key, idx = match.groups()
-                
-                if key:
-                    # Object key access
-                    if not isinstance(current, dict) or key not in current:
-                        return None
-                    current = current[key]
-                else:
-                    # Array index access
-                    index = int(idx)
-                    if not isinstance(current, list) or index >= len(current):
-                        return None
-                    current = current[index]
-                    
-            return current
-            
-        except (KeyError, IndexError, TypeError, ValueError):
-            return None
+        return _walk_path(_path_plan(path), obj)
     
     def _chunk_text(self, text: str) -> List[str]:
         """
@@ -343,27 +373,10 @@ class StreamingJSONProcessor:
     
     def _recursive_chunk(self, text: str) -> List[str]:
         """Simple recursive character-based chunking."""
-        max_chars = int(self.chunking.get("max_chars", 1200))
-        overlap = int(self.chunking.get("overlap", 150))
-        
+        max_chars = self.max_chars
         if len(text) <= max_chars:
             return [text]
-        
-        chunks = []
-        start = 0
-        text_len = len(text)
-        
-        while start < text_len:
-            end = min(text_len, start + max_chars)
-            chunk = text[start:end]
-            chunks.append(chunk)
-            
-            if end == text_len:
-                break
-            
-            start = max(start + 1, end - overlap)
-        
-        return chunks
+        return [text[s:s + max_chars] for s in chunk_window_starts(len(text), max_chars, self.stride)]
     
     def _token_aware_chunk(self, text: str) -> List[str]:
         """Token-aware chunking (placeholder - will be enhanced in batch_manager)."""
@@ -445,7 +458,7 @@ class StreamingFileHandler:
             for line in sample_lines:
                 if line and (line.startswith('{') or line.startswith('"')):
                     try:
-                        json.loads(line)
+                        orjson.loads(line)
                         json_object_count += 1
                     except:
                         pass
@@ -543,4 +556,67 @@ async def get_file_stats(file_path: Union[str, Path]) -> Dict[str, Any]:
         }
         
     finally:
-        file_stream.close()
\ No newline at end of file
+        file_stream.close()
+
+
+# Bytes of an upload sampled by get_file_stats_stream
+STATS_SAMPLE_BYTES = 4 * 1024 * 1024
+
+
+async def get_file_stats_stream(file: Any, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Estimate statistics for an upload from its first STATS_SAMPLE_BYTES, without writing it to disk.
+
+    Args:
+        file: Upload with an async read(n) method and a size attribute (e.g. FastAPI UploadFile)
+        max_bytes: Optional cap; when the size is unknown, counting stops once the bytes read
+            exceed it (file_size_bytes is then a lower bound above max_bytes)
+
+    Returns:
+        Dictionary with the same keys as get_file_stats
+    """
+    sample = await file.read(STATS_SAMPLE_BYTES)
+    file_size = file.size
+    if file_size is None:
+        # Size unknown: count the rest of the stream instead of storing it
+        file_size = len(sample)
+        while (max_bytes is None or file_size <= max_bytes) and (chunk := await file.read(STATS_SAMPLE_BYTES)):
+            file_size += len(chunk)
+
+    consumed = len(sample)
+    gzipped = sample[:2] == b"\x1f\x8b"
+    if gzipped:
+        # Inflate at most a few times the sample; scale by the compressed bytes actually used
+        d = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        text = d.decompress(sample, 4 * STATS_SAMPLE_BYTES)
+        consumed -= len(d.unconsumed_tail)
+        if d.eof:
+            consumed -= len(d.unused_data)
+    else:
+        text = sample
+    complete = consumed >= file_size
+    if not complete:
+        # Drop the partial last line/item
+        text = text[:text.rfind(b"\n") + 1] or text
+        if not gzipped:
+            consumed = len(text)
+
+    detected_format = StreamingFileHandler.detect_format(io.StringIO(text.decode("utf-8", errors="replace")))
+
+    if detected_format == 'json_array':
+        # Roughly ten fields per item, as in get_file_stats
+        sample_items = max(1, text.count(b",") // 10)
+    else:
+        sample_items = sum(1 for line in text.splitlines() if line.strip())
+
+    if complete or not consumed:
+        estimated_items = sample_items
+    else:
+        estimated_items = max(sample_items, round(sample_items * file_size / consumed))
+
+    return {
+        "file_size_bytes": file_size,
+        "detected_format": detected_format,
+        "estimated_items": estimated_items,
+        "file_path": getattr(file, "filename", None)
+    }
\ No newline at end of file
@@ -1,27 +1,70 @@
-import json
+import logging
+
+import orjson
 from datetime import datetime
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from app.core.redis import get_redis_client
 from app.services.api_keys import generate_tenant_id
+from app.services.write_queue import get_write_queue
+
+logger = logging.getLogger(__name__)
 
-def get_tenant_config(tenant_id: str) -> Optional[Dict]:
+async def get_tenant_config(tenant_id: str) -> Optional[Dict]:
     try:
         r = get_redis_client()
-        data = r.get(f"tenant:{tenant_id}")
+        data = await r.get(f"tenant:{tenant_id}")
         if data:
-            return json.loads(data)
+            return orjson.loads(data)
     except Exception as e:
-        print(f"Redis error getting tenant config: {e}")
+        logger.error(f"Redis error getting tenant config: {e}")
     return None
 
-def save_tenant_config(tenant_id: str, config: Dict):
+def tenant_version_key(tenant_id: str) -> str:
+    return f"tenant_ver:{tenant_id}"
+
+async def get_tenant_config_versioned(tenant_id: str) -> Tuple[Optional[Dict], int]:
+    """Get a tenant config and its version counter (bumped on every save) with one MGET."""
+    try:
+        r = get_redis_client()
+        data, version = await r.mget(f"tenant:{tenant_id}", tenant_version_key(tenant_id))
+        if data:
+            return orjson.loads(data), int(version or 0)
+    except Exception as e:
+        logger.error(f"Redis error getting tenant config: {e}")
+    return None, 0
+
+async def get_tenant_version(tenant_id: str) -> Optional[int]:
     try:
         r = get_redis_client()
-        r.set(f"tenant:{tenant_id}", json.dumps(config), ex=None)
+        return int(await r.get(tenant_version_key(tenant_id)) or 0)
     except Exception as e:
-        print(f"Redis error saving tenant config: {e}")
+        logger.error(f"Redis error getting tenant version: {e}")
+    return None
+
+async def save_tenant_config(tenant_id: str, config: Dict):
+    try:
+        await get_write_queue().write(
+            f"tenant:{tenant_id}", orjson.dumps(config), bump_key=tenant_version_key(tenant_id)
+        )
+    except Exception as e:
+        logger.error(f"Redis error saving tenant config: {e}")
         raise
 
+# Embedding providers that need an API key in rag.provider_keys, with their display names
+EMBEDDING_KEY_LABELS = {"openai": "OpenAI", "voyageai": "VoyageAI"}
+
+def validate_rag(rag: Dict) -> None:
+    """Check an enabled RAG config has its Milvus fields and embedding key; raises ValueError."""
+    if rag.get("provider") == "milvus":
+        milvus = rag.get("milvus") or {}
+        for field in ("uri", "collection"):
+            if not milvus.get(field):
+                raise ValueError(f"rag.milvus.{field} is required when RAG is enabled")
+    emb_provider = rag.get("embedding_provider", "sentence_transformers")
+    label = EMBEDDING_KEY_LABELS.get(emb_provider)
+    if label and not (rag.get("provider_keys") or {}).get(emb_provider):
+        raise ValueError(f"{label} embedding requires rag.provider_keys.{emb_provider}")
+
 def new_tenant_config(registration, defaults) -> Dict:
     cfg = {
         "openrouter_api_key": registration.openrouter_api_key,
@@ -35,5 +78,5 @@ def new_tenant_config(registration, defaults) -> Dict:
         "updated_at": datetime.utcnow().isoformat(),
     }
     if getattr(registration, "rag", None):
-        cfg["rag"] = registration.rag.dict()
+        cfg["rag"] = registration.rag.model_dump()
     return cfg
\ No newline at end of file
@@ -0,0 +1,119 @@
+"""
+Process-local TTL cache in front of get_tenant_config for the request hot path.
+Entries expire after TENANT_CONFIG_CACHE_TTL seconds; admin updates invalidate locally.
+An expired entry is revalidated against the tenant's version counter in Redis and
+reused when no save happened since it was loaded, so the config is only re-read
+and re-parsed after it actually changed.
+
+Invalidation is not published to other processes: the worker that saved a config
+drops its entry at once, while other workers keep serving theirs until it expires,
+so they may see a change up to TENANT_CONFIG_CACHE_TTL seconds late. The version
+counter is only checked on expiry, never per request.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from app.core.config import settings
+from app.services.tenants import get_tenant_config_versioned, get_tenant_version
+
+_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.TENANT_CONFIG_CACHE_TTL)
+# In-flight loads; concurrent misses for a tenant await the same task until it has filled the cache
+_loading: Dict[str, "asyncio.Task[Optional[Dict]]"] = {}
+_resolved_rag: TTLCache = TTLCache(maxsize=1024, ttl=settings.TENANT_CONFIG_CACHE_TTL)
+# (version, config) of each tenant's last load, kept well past the TTL for revalidation
+_loaded: TTLCache = TTLCache(maxsize=1024, ttl=settings.TENANT_CONFIG_CACHE_TTL * 20)
+# Bumped by invalidate_tenant_config; a load that spans an invalidation may have read the old
+# config, so its result is returned but not cached
+_generations: Dict[str, int] = {}
+
+
+@dataclass(frozen=True)
+class ResolvedRagConfig:
+    """A tenant's `rag` settings with defaults applied, as used by the RAG endpoints."""
+    enabled: bool
+    provider: Optional[str]
+    milvus_conf: Optional[Dict[str, Any]]
+    emb_provider: str
+    emb_model: str
+    provider_keys: Dict[str, str] = field(default_factory=dict)
+    max_upload_mb: int = 1000
+
+    @property
+    def milvus_ready(self) -> bool:
+        return self.provider == "milvus" and bool(self.milvus_conf)
+
+    @classmethod
+    def from_rag(cls, rag: Dict[str, Any]) -> "ResolvedRagConfig":
+        return cls(
+            enabled=bool(rag.get("enabled")),
+            provider=rag.get("provider"),
+            milvus_conf=rag.get("milvus"),
+            emb_provider=rag.get("embedding_provider", "sentence_transformers"),
+            emb_model=rag.get("embedding_model", "sentence-transformers/all-MiniLM-L6-v2"),
+            provider_keys=rag.get("provider_keys") or {},
+            max_upload_mb=int(rag.get("max_upload_mb", 1000)),
+        )
+
+
+async def get_tenant_config_cached(tenant_id: str) -> Optional[Dict]:
+    """
+    Get tenant config, served from process memory when fresh.
+
+    Concurrent misses for the same tenant share one Redis lookup, which is a GET of
+    the version counter when a previously loaded config can be revalidated. Unknown
+    tenants (None) are not cached. Callers must treat the returned dict as read-only.
+    """
+    config = _cache.get(tenant_id)
+    if config is not None:
+        return config
+
+    task = _loading.get(tenant_id)
+    if task is None:
+        task = _loading[tenant_id] = asyncio.ensure_future(
+            _load_tenant_config(tenant_id, _generations.get(tenant_id, 0))
+        )
+        task.add_done_callback(lambda done: _loading.pop(tenant_id, None) if _loading.get(tenant_id) is done else None)
+    # A cancelled caller must not cancel the load the other callers are waiting on
+    return await asyncio.shield(task)
+
+
+async def _load_tenant_config(tenant_id: str, generation: int) -> Optional[Dict]:
+    loaded = _loaded.get(tenant_id)
+    if loaded is not None and await get_tenant_version(tenant_id) == loaded[0]:
+        config = loaded[1]
+    else:
+        config, version = await get_tenant_config_versioned(tenant_id)
+        if config is not None and _generations.get(tenant_id, 0) == generation:
+            _loaded[tenant_id] = (version, config)
+    if config is not None and _generations.get(tenant_id, 0) == generation:
+        _cache[tenant_id] = config
+    return config
+
+
+async def get_resolved_rag(tenant_id: str) -> Optional[ResolvedRagConfig]:
+    """Get the tenant's resolved RAG settings (None for unknown tenants), built once per cache period."""
+    resolved = _resolved_rag.get(tenant_id)
+    if resolved is not None:
+        return resolved
+    generation = _generations.get(tenant_id, 0)
+    config = await get_tenant_config_cached(tenant_id)
+    if config is None:
+        return None
+    resolved = ResolvedRagConfig.from_rag(config.get("rag") or {})
+    if _generations.get(tenant_id, 0) == generation:
+        _resolved_rag[tenant_id] = resolved
+    return resolved
+
+
+def invalidate_tenant_config(tenant_id: str):
+    """Drop a cached tenant config in this process (call after saving changes; other workers catch up on expiry)."""
+    _generations[tenant_id] = _generations.get(tenant_id, 0) + 1
+    # Misses from here on start a fresh load instead of joining one that may return the old config
+    _loading.pop(tenant_id, None)
+    _cache.pop(tenant_id, None)
+    _loaded.pop(tenant_id, None)
+    _resolved_rag.pop(tenant_id, None)
\ No newline at end of file
@@ -11,6 +11,14 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _cached_token_count(encoding_name: str, text: str) -> int:
+    """Token count of text under a tiktoken encoding, memoized across counters."""
+    # encode_ordinary: special-token markers are counted as plain text (as the API sees them),
+    # skipping encode()'s scan for them and its error when one turns up
+    return len(tiktoken.get_encoding(encoding_name).encode_ordinary(text))
+
+
 class VoyageTokenCounter:
     """Token-aware counting for VoyageAI models with safety margins."""
     
@@ -62,12 +70,34 @@ class VoyageTokenCounter:
             return 0
             
         try:
-            return len(self.tokenizer.encode(text))
+            return _cached_token_count(self.tokenizer.name, text)
         except Exception as e:
             logger.error(f"Error counting tokens for text: {e}")
             # Fallback estimation: ~4 chars per token
             return len(text) // 4
     
+    def count_tokens_batch(self, texts: List[str], chunk_size: int = 1000) -> List[int]:
+        """
+        Count tokens for many texts with batched tokenizer calls.
+        
+        Args:
+            texts: Input texts
+            chunk_size: Texts encoded per tokenizer call (bounds the token ids held at once)
+            
+        Returns:
+            Number of tokens in each text, in the same order
+        """
+        counts: List[int] = []
+        for start in range(0, len(texts), chunk_size):
+            chunk = texts[start:start + chunk_size]
+            try:
+                counts.extend(len(ids) for ids in self.tokenizer.encode_ordinary_batch(chunk))
+            except Exception as e:
+                # Count one by one so only the failing text falls back
+                logger.debug(f"Batch token count failed, counting texts individually: {e}")
+                counts.extend(self.count_tokens(text) for text in chunk)
+        return counts
+    
     def estimate_batch_tokens(self, texts: List[str]) -> int:
         """
         Estimate total tokens for a batch of texts.
@@ -164,6 +194,33 @@ class AdaptiveBatchSizer:
             
             self.sample_count = min(self.sample_count + 1, self.max_samples)
     
+    def update_batch_statistics(self, char_count: int, token_count: int, text_count: int):
+        """
+        Update token/character ratio from several texts at once.
+        
+        The texts' combined ratio gets the weight text_count separate update_statistics
+        calls would have given it.
+        
+        Args:
+            char_count: Total characters of the texts
+            token_count: Total tokens of the texts
+            text_count: Number of texts
+        """
+        if char_count <= 0 or text_count <= 0:
+            return
+        ratio = token_count / char_count
+        
+        if self.sample_count == 0:
+            self.avg_tokens_per_char = ratio
+        else:
+            alpha = min(0.1, 1.0 / self.sample_count)
+            weight = 1 - (1 - alpha) ** text_count
+            self.avg_tokens_per_char = (
+                weight * ratio + (1 - weight) * self.avg_tokens_per_char
+            )
+        
+        self.sample_count = min(self.sample_count + text_count, self.max_samples)
+    
     def estimate_tokens_fast(self, text: str) -> int:
         """
         Fast token estimation based on character count and learned ratio.
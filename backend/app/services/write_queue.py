@@ -0,0 +1,84 @@
+"""
+Coalescing writer for small Redis writes (tenant configs).
+Writes submitted while a flush is in flight are sent together in the next
+MULTI/EXEC pipeline, so bursts such as bulk tenant provisioning cost one round
+trip per batch instead of one per write. Callers still await their own write
+and see its error (a failed flush fails every write in it), so a saved config
+is readable as soon as the call returns.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Write:
+    key: str
+    value: bytes
+    bump_key: Optional[str]
+    future: asyncio.Future
+
+
+class RedisWriteQueue:
+    """Batches concurrent SETs (each optionally bumping a counter key) into pipelined flushes."""
+
+    def __init__(self, redis_client=None, max_batch: int = 100):
+        self.redis = redis_client or get_redis_client()
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def write(self, key: str, value: bytes, bump_key: Optional[str] = None):
+        """SET key to value (and INCR bump_key) in the next flush; returns once it is committed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._writer is None or self._writer.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._drain(self._queue))
+        write = _Write(key, value, bump_key, loop.create_future())
+        self._queue.put_nowait(write)
+        await write.future
+
+    async def _drain(self, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[_Write]):
+        pipe = self.redis.pipeline(transaction=True)
+        for w in batch:
+            pipe.set(w.key, w.value)
+            if w.bump_key:
+                pipe.incr(w.bump_key)
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis write flush of {len(batch)} item(s) failed: {e}")
+            for w in batch:
+                if not w.future.done():
+                    w.future.set_exception(e)
+            return
+        for w in batch:
+            if not w.future.done():
+                w.future.set_result(None)
+
+
+# Global write queue instance
+_write_queue: Optional[RedisWriteQueue] = None
+
+
+def get_write_queue() -> RedisWriteQueue:
+    """Get global write queue instance."""
+    global _write_queue
+    if _write_queue is None:
+        _write_queue = RedisWriteQueue()
+    return _write_queue
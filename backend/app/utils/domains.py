@@ -1,5 +1,13 @@
+import re
+from functools import lru_cache
 from urllib.parse import urlparse
 
+# A normalized allowed-domains entry: host labels (or a bare name such as localhost), an optional
+# port, and an optional leading "*." wildcard
+_DOMAIN_RE = re.compile(
+    r"\A(?:\*\.)?[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?)*(?::\d{1,5})?\Z"
+)
+
 def normalize_domain(domain: str) -> str:
     if "://" in domain:
         domain = domain.split("://")[1]
@@ -9,6 +17,21 @@ def normalize_domain(domain: str) -> str:
         domain = domain[4:]
     return domain.lower()
 
+def is_valid_domain(domain: str) -> bool:
+    return bool(domain) and _DOMAIN_RE.match(normalize_domain(domain)) is not None
+
+@lru_cache(maxsize=1024)
+def _domain_sets(allowed_domains: tuple[str, ...]) -> tuple[frozenset[str], frozenset[str]]:
+    # (exact domains, wildcard bases), normalized once per distinct allowed-domains list
+    exact, wildcard = set(), set()
+    for allowed in allowed_domains:
+        allowed_norm = normalize_domain(allowed)
+        if allowed_norm.startswith("*."):
+            wildcard.add(allowed_norm[2:])
+        else:
+            exact.add(allowed_norm)
+    return frozenset(exact), frozenset(wildcard)
+
 def validate_origin(origin: str | None, allowed_domains: list[str]) -> bool:
     if not origin:
         return False
@@ -20,14 +43,14 @@ def validate_origin(origin: str | None, allowed_domains: list[str]) -> bool:
     except Exception:
         return False
 
-    for allowed in allowed_domains:
-        allowed_norm = normalize_domain(allowed)
-        if allowed_norm.startswith("*."):
-            base = allowed_norm[2:]
-            if origin_domain == base or origin_domain.endswith(f".{base}"):
-                return True
-        elif origin_domain == allowed_norm:
-            return True
-        elif allowed_norm.startswith("localhost:") and origin_domain == allowed_norm:
+    exact, wildcard = _domain_sets(tuple(allowed_domains))
+    if origin_domain in exact:
+        return True
+    # "*.base" matches base itself and any subdomain of it
+    domain = origin_domain
+    while True:
+        if domain in wildcard:
             return True
-    return False
\ No newline at end of file
+        _, dot, domain = domain.partition(".")
+        if not dot:
+            return False
@@ -119,11 +119,11 @@ async def check_redis_connection():
         r = get_conversation_redis()
         if r:
             # Try to ping Redis
-            r.ping()
+            await r.ping()
             print("✅ Redis is connected and accessible")
             
             # Check if any conversations exist
-            keys = r.keys("conversation:*")
+            keys = await r.keys("conversation:*")
             print(f"   Found {len(keys)} existing conversation keys")
             if keys:
                 print(f"   Sample keys: {keys[:3]}")
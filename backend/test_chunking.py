@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the char-window chunker shared by the streaming parser and the
+RAG upload route. The windows must match the original while-loop splitter for any
+max_chars/overlap, including negative overlap (gaps between windows).
+"""
+
+import io
+import random
+
+from app.services.streaming_parser import StreamingJSONProcessor, chunk_window_starts
+
+
+def _reference_chunks(text: str, max_chars: int, overlap: int) -> list:
+    """The original loop-based splitter the window helper replaced."""
+    if len(text) <= max_chars:
+        return [text]
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        chunks.append(text[start:end])
+        if end == len(text):
+            break
+        start = max(start + 1, end - overlap)
+    return chunks
+
+
+def _window_chunks(text: str, max_chars: int, overlap: int) -> list:
+    stride = max(1, max_chars - overlap)
+    return [text[s:s + max_chars] for s in chunk_window_starts(len(text), max_chars, stride)]
+
+
+def test_negative_overlap_has_no_empty_tail():
+    """A stride wider than the window must not yield a trailing empty chunk."""
+    text = "abcdefghijklmnopqrstuvwx"
+    chunks = _window_chunks(text, max_chars=2, overlap=-1)
+    assert "" not in chunks
+    assert chunks == _reference_chunks(text, 2, -1)
+    assert list(chunk_window_starts(24, 2, 3)) == [0, 3, 6, 9, 12, 15, 18, 21]
+
+
+def test_windows_match_reference_loop():
+    rng = random.Random(7)
+    for _ in range(5000):
+        text = "x" * rng.randint(0, 80)
+        max_chars = rng.randint(1, 25)
+        overlap = rng.randint(-30, 30)
+        assert _window_chunks(text, max_chars, overlap) == _reference_chunks(text, max_chars, overlap), \
+            (len(text), max_chars, overlap)
+
+
+def test_streaming_processor_recursive_chunk():
+    text = "".join(chr(ord("a") + i % 26) for i in range(50))
+    for overlap in (-4, 0, 3):
+        processor = StreamingJSONProcessor(io.BytesIO(b"[]"), {
+            "format": "json_array",
+            "mapping": {"content_path": "text"},
+            "chunking": {"strategy": "recursive", "max_chars": 7, "overlap": overlap},
+        })
+        assert processor._recursive_chunk(text) == _reference_chunks(text, 7, overlap)
+
+
+def test_upload_route_chunker_negative_overlap():
+    """The RAG upload route builds its splitter on the same helper."""
+    from app.api.routes.rag import _make_chunker
+
+    text = "abcdefghijklmnopqrstuvwx"
+    chunk = _make_chunker({"strategy": "recursive", "max_chars": 2, "overlap": -1})
+    assert chunk(text) == _reference_chunks(text, 2, -1)
+    assert "" not in chunk(text)
+    assert _make_chunker({"strategy": "none"})(text) == [text]
+
+
+if __name__ == "__main__":
+    test_negative_overlap_has_no_empty_tail()
+    test_windows_match_reference_loop()
+    test_streaming_processor_recursive_chunk()
+    test_upload_route_chunker_negative_overlap()
+    print("Chunking checks passed")
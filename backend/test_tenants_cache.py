@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the process-local tenant config cache: concurrent misses for one
+tenant must share a single Redis load, including for unknown tenants, which are not cached.
+"""
+
+import asyncio
+
+from app.services import tenants_cache
+
+
+def _patch_loader(monkeypatch, config):
+    calls = []
+
+    async def get_tenant_config_versioned(tenant_id):
+        calls.append(tenant_id)
+        await asyncio.sleep(0.01)
+        return config, 1
+
+    async def get_tenant_version(tenant_id):
+        return 1
+
+    monkeypatch.setattr(tenants_cache, "get_tenant_config_versioned", get_tenant_config_versioned)
+    monkeypatch.setattr(tenants_cache, "get_tenant_version", get_tenant_version)
+    tenants_cache.invalidate_tenant_config("tenant-a")
+    return calls
+
+
+def test_concurrent_misses_share_one_load(monkeypatch):
+    calls = _patch_loader(monkeypatch, {"rag": {"enabled": True}})
+
+    async def run():
+        return await asyncio.gather(*[tenants_cache.get_tenant_config_cached("tenant-a") for _ in range(20)])
+
+    results = asyncio.run(run())
+    assert calls == ["tenant-a"]
+    assert all(r == {"rag": {"enabled": True}} for r in results)
+    assert not tenants_cache._loading
+
+
+def test_unknown_tenant_misses_share_one_load(monkeypatch):
+    calls = _patch_loader(monkeypatch, None)
+
+    async def run():
+        return await asyncio.gather(*[tenants_cache.get_tenant_config_cached("tenant-a") for _ in range(20)])
+
+    assert asyncio.run(run()) == [None] * 20
+    assert calls == ["tenant-a"]
+
+
+def test_cancelled_caller_does_not_cancel_shared_load(monkeypatch):
+    calls = _patch_loader(monkeypatch, {"rag": {}})
+
+    async def run():
+        first = asyncio.ensure_future(tenants_cache.get_tenant_config_cached("tenant-a"))
+        second = asyncio.ensure_future(tenants_cache.get_tenant_config_cached("tenant-a"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == {"rag": {}}
+    assert calls == ["tenant-a"]
+
+
+def test_load_spanning_invalidation_is_not_cached(monkeypatch):
+    """A load that read the config before a save must not put it back after the invalidation."""
+    configs = [{"rag": {"enabled": False}}, {"rag": {"enabled": True}}]
+    calls = []
+
+    async def get_tenant_config_versioned(tenant_id):
+        config = configs[len(calls)]
+        calls.append(tenant_id)
+        await asyncio.sleep(0.01)
+        return config, len(calls)
+
+    async def get_tenant_version(tenant_id):
+        return len(calls)
+
+    monkeypatch.setattr(tenants_cache, "get_tenant_config_versioned", get_tenant_config_versioned)
+    monkeypatch.setattr(tenants_cache, "get_tenant_version", get_tenant_version)
+    tenants_cache.invalidate_tenant_config("tenant-a")
+
+    async def run():
+        stale = asyncio.ensure_future(tenants_cache.get_resolved_rag("tenant-a"))
+        while not calls:
+            await asyncio.sleep(0)
+        # The admin save lands while the first load is still reading
+        tenants_cache.invalidate_tenant_config("tenant-a")
+        await stale
+        return await tenants_cache.get_resolved_rag("tenant-a")
+
+    resolved = asyncio.run(run())
+    assert resolved.enabled
+    assert calls == ["tenant-a", "tenant-a"]
+    assert tenants_cache._cache["tenant-a"] == {"rag": {"enabled": True}}
+
+
+if __name__ == "__main__":
+    import sys
+
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
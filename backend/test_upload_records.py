@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Regression checks for the streaming upload reader behind /rag/ingest-file: JSON arrays
+and NDJSON, plain or gzip-compressed (including concatenated members), read in chunks
+small enough that records and lines straddle chunk boundaries.
+"""
+
+import asyncio
+import gzip
+import io
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import rag
+
+RECORDS = [{"id": i, "text": f"record {i} " + "x" * (i % 13), "score": i / 4} for i in range(40)]
+
+
+@pytest.fixture(autouse=True)
+def small_reads(monkeypatch):
+    # A few bytes per read so records, lines and gzip members are split across chunks
+    monkeypatch.setattr(rag, "_UPLOAD_READ_CHUNK", 7)
+
+
+def _records(data: bytes, fmt: str) -> list:
+    return list(rag._iter_upload_records(io.BytesIO(data), fmt))
+
+
+def _ndjson(records) -> bytes:
+    return b"\n".join(orjson.dumps(r) for r in records) + b"\n"
+
+
+def test_json_array():
+    assert _records(orjson.dumps(RECORDS), "json_array") == RECORDS
+    assert _records(b"  \n [" + b", ".join(orjson.dumps(r) for r in RECORDS) + b"]\n", "json_array") == RECORDS
+    assert _records(b"[]", "json_array") == []
+
+
+def test_ndjson_blank_lines_and_missing_trailing_newline():
+    data = b"\n\n" + _ndjson(RECORDS[:20]) + b"   \n" + _ndjson(RECORDS[20:]).rstrip(b"\n")
+    assert _records(data, "ndjson") == RECORDS
+
+
+def test_gzip_json_array_and_ndjson():
+    assert _records(gzip.compress(orjson.dumps(RECORDS)), "json_array") == RECORDS
+    assert _records(gzip.compress(_ndjson(RECORDS)), "ndjson") == RECORDS
+
+
+def test_concatenated_gzip_members():
+    data = gzip.compress(_ndjson(RECORDS[:15])) + gzip.compress(_ndjson(RECORDS[15:]))
+    assert _records(data, "ndjson") == RECORDS
+
+
+def test_highly_compressed_upload_is_inflated_in_bounded_pieces():
+    text = "y" * 5000
+    chunks = list(rag._iter_upload_chunks(io.BytesIO(gzip.compress(_ndjson([{"text": text}] * 50)))))
+    assert max(len(c) for c in chunks) <= 7
+    assert _records(gzip.compress(_ndjson([{"text": text}] * 50)), "ndjson") == [{"text": text}] * 50
+
+
+@pytest.mark.parametrize("data, fmt", [
+    (b'{"id": 1}', "json_array"),
+    (b"[1, 2,", "json_array"),
+    (b'{"id": 1}\n{"id": \n', "ndjson"),
+])
+def test_malformed_upload_is_rejected_with_400(data, fmt):
+    with pytest.raises(HTTPException) as exc:
+        _records(data, fmt)
+    assert exc.value.status_code == 400
+
+
+def _ingest(monkeypatch, data: bytes, fmt: str, validator=None, upserted=None) -> list:
+    """Run _ingest_upload over data with a stub Milvus ingest; returns the upserted batch sizes."""
+    upserted = [] if upserted is None else upserted
+
+    async def ingest_to_milvus_async(texts, metadatas, **kwargs):
+        upserted.append(len(texts))
+        return {"upserted": len(texts), "dim": 3}
+
+    monkeypatch.setattr(rag, "ingest_to_milvus_async", ingest_to_milvus_async)
+    monkeypatch.setattr(rag, "_INGEST_BATCH", 8)
+    asyncio.run(rag._ingest_upload(io.BytesIO(data), fmt, validator, "text", {"id": "id"}, {"strategy": "none"}))
+    return upserted
+
+
+def test_ingest_upserts_every_batch(monkeypatch):
+    assert _ingest(monkeypatch, _ndjson(RECORDS), "ndjson") == [8, 8, 8, 8, 8]
+
+
+def test_late_parse_error_writes_nothing(monkeypatch):
+    """A malformed record after several batches' worth of good ones is rejected before any upsert."""
+    upserted = []
+    with pytest.raises(HTTPException) as exc:
+        _ingest(monkeypatch, _ndjson(RECORDS) + b'{"id": 41, "text": \n', "ndjson", upserted=upserted)
+    assert exc.value.status_code == 400
+    assert upserted == []
+
+
+def test_late_validation_error_writes_nothing(monkeypatch):
+    upserted = []
+    validator = rag._compile_validator(orjson.dumps({"required": ["text"]}, option=orjson.OPT_SORT_KEYS))
+    with pytest.raises(HTTPException) as exc:
+        _ingest(monkeypatch, orjson.dumps(RECORDS + [{"id": 99}]), "json_array", validator, upserted)
+    assert exc.value.status_code == 400
+    assert exc.value.detail["validation_errors"][0]["index"] == len(RECORDS)
+    assert upserted == []
+
+
+def test_validator_ignores_format_keywords():
+    """Like Draft7Validator without a format checker, "format" is annotation only."""
+    validator = rag._compile_validator(orjson.dumps({
+        "type": "object",
+        "properties": {"email": {"type": "string", "format": "email"}, "when": {"format": "not-a-known-format"}},
+    }, option=orjson.OPT_SORT_KEYS))
+    validator({"email": "not-an-email", "when": "whenever"})
+    with pytest.raises(rag.fastjsonschema.JsonSchemaValueException):
+        validator({"email": 5})
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(pytest.main([__file__, "-q"]))